@@ -1,21 +1,22 @@
-from flask import Flask, request, jsonify, render_template
-from newsapi import NewsApiClient
+from flask import Flask, Response, redirect, request, jsonify, render_template
 from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
+from functools import cached_property
+from werkzeug.utils import import_string
 import time
+import queue
 import re
-import json
 
-# Import the quiz and chatbot modules
-from quiz import quiz_bp
-from chatbot import chatbot_bp
+import config
+from cache import article_cache, headline_cache, summary_cache
+from deadline import request_deadline
+from http_cache import conditional_json, init_app as init_http_cache
+from profiling import init_app as init_profiling, stage
+from local_quiz import extract_key_facts
+from headlines import CursorError, merge_headlines, normalize_published_at, paginate, parse_fields
+from news_push import HeadlineHub, headline_version, sse_event
 
-# --- API KEYS & CONFIGURATION ---
-NEWS_API_KEY = "18e2e010c3a248b6b92920a880dd5425" 
-OPENROUTER_API_KEY = "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"
-
-newsapi = NewsApiClient(api_key=NEWS_API_KEY)
+# requests, bs4, newsapi and the quiz/chatbot modules are imported on first
+# use so that a cold start only pays for Flask itself.
 
 # Define available filters for the UI
 COUNTRIES = {
@@ -26,177 +27,125 @@ CATEGORIES = ['General', 'Business', 'Technology', 'Science', 'Health', 'Sports'
 
 # Initialize Flask App
 app = Flask(__name__)
+init_http_cache(app)
+init_profiling(app)
+
+# =============================================================================
+# LAZY LOADING
+# =============================================================================
+
+class LazyView:
+    """View that imports its module on the first request that needs it."""
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+
+    @cached_property
+    def view(self):
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+# The only routing table for the quiz and chatbot views (their modules are not
+# imported until one of these routes is hit)
+LAZY_ROUTES = [
+    ('/api/quiz/generate', 'quiz.generate_quiz_endpoint', ['POST']),
+    ('/api/quiz/submit', 'quiz.submit_quiz', ['POST']),
+    ('/api/chat/send', 'chatbot.chat_send', ['POST', 'OPTIONS']),
+    ('/api/chat/rate-limit-info', 'chatbot.rate_limit_info', ['GET']),
+]
+
+for rule, import_name, methods in LAZY_ROUTES:
+    app.add_url_rule(rule, endpoint=import_name, view_func=LazyView(import_name), methods=methods)
+
+_newsapi = None
+
 
-# Register blueprints from other modules
-app.register_blueprint(quiz_bp)
-app.register_blueprint(chatbot_bp)
+def get_newsapi():
+    """Create the NewsAPI client on first use."""
+    global _newsapi
+    if _newsapi is None:
+        import requests
+        from newsapi import NewsApiClient
 
-print("🚀 AI Current Affairs Digest - All Services Integrated")
+        class NewsApiSession(requests.Session):
+            """Keeps connections to NewsAPI alive and sends them to NEWSAPI_BASE_URL."""
+
+            def request(self, method, url, *args, **kwargs):
+                if url.startswith('https://newsapi.org'):
+                    url = config.NEWSAPI_BASE_URL.rstrip('/') + url[len('https://newsapi.org'):]
+                return super().request(method, url, *args, **kwargs)
+
+        _newsapi = NewsApiClient(api_key=config.NEWS_API_KEY, session=NewsApiSession())
+    return _newsapi
+
+
+def warm_up():
+    """Import everything that is otherwise loaded lazily (used before forking workers)."""
+    import requests, bs4, newsapi  # noqa: F401
+    import extraction, fetcher, image_proxy  # noqa: F401
+    for view_func in app.view_functions.values():
+        if isinstance(view_func, LazyView):
+            view_func.view
+    get_newsapi()
+
+
+if config.EAGER_LOAD:
+    warm_up()
 
 # =============================================================================
 # NEWS SUMMARIZATION FUNCTIONS
 # =============================================================================
 
-def extract_article_text_robust(url):
+def extract_article_text_robust(url, deadline=None):
     """Enhanced article extraction with multiple fallback strategies."""
+    from extraction import parse_article_html, run_parser
+    from fetcher import fetch_html
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        with stage('fetch'):
+            html = fetch_html(url, timeout=15, deadline=deadline)
         
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove unwanted elements more aggressively
-        for element in soup(["script", "style", "nav", "header", "footer", "aside", 
-                           "iframe", "noscript", "button", "form", "input", "select"]):
-            element.decompose()
-        
-        # Remove elements with common non-content classes
-        non_content_selectors = [
-            '.ad', '.ads', '.advertisement', '.social', '.share', '.comments',
-            '.newsletter', '.popup', '.modal', '.menu', '.sidebar', '.breadcrumb',
-            '.pagination', '.related', '.recommended', '.trending'
-        ]
-        for selector in non_content_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-        
-        article_text = None
-        extraction_method = "unknown"
-        
-        # Strategy 1: Look for JSON-LD structured data (most reliable)
-        json_ld = soup.find('script', type='application/ld+json')
-        if json_ld:
-            try:
-                data = json.loads(json_ld.string)
-                if isinstance(data, dict) and 'articleBody' in data:
-                    article_text = data['articleBody']
-                    extraction_method = "json_ld"
-                    print("✅ Extracted via JSON-LD")
-            except:
-                pass
-        
-        # Strategy 2: Article tag with content scoring
-        if not article_text:
-            articles = soup.find_all('article')
-            for article in articles:
-                text = article.get_text(separator=' ', strip=True)
-                word_count = len(text.split())
-                if word_count > 100:
-                    article_text = text
-                    extraction_method = "article_tag"
-                    print("✅ Extracted via article tag")
-                    break
+        # A page cut off by the deadline is still parsed, so its text can feed the fallbacks
+        parse_timeout = None
+        if deadline is not None:
+            parse_timeout = deadline.timeout(cap=config.EXTRACTION_TIMEOUT, minimum=config.PARTIAL_PARSE_TIMEOUT)
+        with stage('parse'):
+            result = run_parser(parse_article_html, html, timeout=parse_timeout)
         
-        # Strategy 3: Common content containers with scoring
-        if not article_text:
-            content_selectors = [
-                'main', '[role="main"]', '.content', '.post-content', 
-                '.article-content', '.entry-content', '.story-content',
-                '.post-body', '.article-body', '.story-body', '.content-body',
-                '[itemprop="articleBody"]', '.article__body', '.article-text'
-            ]
-            
-            best_text = ""
-            best_score = 0
-            
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text(separator=' ', strip=True)
-                    words = text.split()
-                    word_count = len(words)
-                    
-                    # Score based on word count and paragraph structure
-                    paragraphs = len(element.find_all('p', recursive=False))
-                    score = word_count + (paragraphs * 10)
-                    
-                    if score > best_score and word_count > 50:
-                        best_score = score
-                        best_text = text
-            
-            if best_text:
-                article_text = best_text
-                extraction_method = f"content_container (score: {best_score})"
-                print(f"✅ Extracted via content container")
-        
-        # Strategy 4: Smart paragraph collection (fallback)
-        if not article_text:
-            all_paragraphs = soup.find_all('p')
-            if len(all_paragraphs) > 3:
-                # Filter paragraphs by length and content quality
-                good_paragraphs = []
-                for p in all_paragraphs:
-                    text = p.get_text(strip=True)
-                    words = text.split()
-                    if len(words) > 15 and len(words) < 200:
-                        if not any(word in text.lower() for word in ['login', 'sign up', 'subscribe', 'read more', 'click here']):
-                            good_paragraphs.append(text)
-                
-                if len(good_paragraphs) >= 3:
-                    article_text = ' '.join(good_paragraphs)
-                    extraction_method = "smart_paragraphs"
-                    print(f"✅ Extracted via {len(good_paragraphs)} smart paragraphs")
-        
-        # Strategy 5: Meta description as last resort
-        if not article_text:
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                article_text = meta_desc.get('content')
-                extraction_method = "meta_description"
-                print("✅ Extracted via meta description")
-        
-        # Clean and normalize the extracted text
-        if article_text:
-            # Remove extra whitespace
-            article_text = re.sub(r'\s+', ' ', article_text).strip()
-            
-            # Remove very short lines that are likely noise
-            lines = article_text.split('. ')
-            cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 20]
-            article_text = '. '.join(cleaned_lines)
-            
-            # Limit length for API constraints
-            words = article_text.split()
-            if len(words) > 1500:
-                article_text = ' '.join(words[:1500])
-                print(f"📝 Trimmed to 1500 words")
-            
-            word_count = len(words)
-            print(f"📊 Extraction: {extraction_method}, Words: {word_count}")
-            
-            if word_count >= 30:
-                return article_text
-        
-        print("❌ No sufficient text extracted")
-        return None
+        return result['text'] if result else None
         
     except Exception as e:
         print(f"❌ Extraction error: {e}")
         return None
 
-def generate_reliable_summary(text, title, url):
-    """Generate summary with multiple fallback strategies."""
+def generate_reliable_summary(text, title, url, deadline=None):
+    """Generate summary with multiple fallback strategies.
+
+    Returns ``(summary, source)``; source is "ai" or "extract".
+    """
     
     # Fallback 1: Use OpenRouter with simple prompt
-    summary = try_openrouter_summary(text, title)
+    summary = try_openrouter_summary(text, title, deadline)
     if summary:
-        return summary
+        return summary, 'ai'
     
     # Fallback 2: If OpenRouter fails, create a basic summary from extracted text
-    return create_basic_summary(text, title, url)
+    return create_basic_summary(text, title, url), 'extract'
 
-def try_openrouter_summary(text, title):
+def try_openrouter_summary(text, title, deadline=None):
     """Try to get summary from OpenRouter with simple reliable prompt."""
+    import requests
+    
     try:
+        # Leave enough of the request's budget for the local fallback
+        timeout = 30
+        if deadline is not None:
+            timeout = deadline.timeout(cap=timeout, reserve=config.FALLBACK_RESERVE)
+        
         # Very simple prompt for reliability
         prompt = f"""Summarize this news article in 3-4 sentences. Focus on the main facts.
 
@@ -206,21 +155,22 @@ Content: {text[:2500]}
 
 Summary:"""
         
-        url = "https://openrouter.ai/api/v1/chat/completions"
+        url = config.OPENROUTER_URL
         
         headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
         }
         
         payload = {
-            "model": "google/gemini-2.0-flash-exp:free",
+            "model": config.OPENROUTER_MODEL,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.1,
             "max_tokens": 300,
         }
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        with stage('llm'):
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
         
         if response.status_code == 200:
             result = response.json()
@@ -256,63 +206,157 @@ def create_basic_summary(text, title, url):
     except:
         return f"Summary unavailable for this article. Please visit the source for full content: {url}"
 
+# =============================================================================
+# NEWS HEADLINE FUNCTIONS
+# =============================================================================
+
+def load_headlines(country_code, category):
+    """Fetch top headlines from NewsAPI and shape them for the UI."""
+    from image_proxy import proxy_url
+    
+    top_headlines = get_newsapi().get_top_headlines(
+        category=category,
+        country=country_code,
+        language='en',
+        page_size=config.HEADLINE_FETCH_SIZE,
+    )
+
+    articles = []
+    for article in top_headlines.get('articles', []):
+        published_at = article.get('publishedAt', '')
+        
+        try:
+            published_date_fmt = datetime.strptime(published_at[:10], '%Y-%m-%d').strftime('%b %d, %Y')
+        except ValueError:
+            published_date_fmt = "Recent"
+        
+        raw_description = article.get('description')
+        if raw_description:
+            processed_description = raw_description.split('.')[0].strip() + '...'
+        else:
+            processed_description = 'Click to read the full article.'
+
+        articles.append({
+            'title': article.get('title', 'No Title'),
+            'source': article.get('source', {}).get('name', 'Unknown'),
+            'description': processed_description,
+            'url': article.get('url'),
+            'image': proxy_url(article.get('urlToImage')),
+            'published': published_date_fmt,
+            'published_at': normalize_published_at(published_at)
+        })
+    
+    return articles
+
+def _headline_entry(topic):
+    entry = headline_cache.get(topic)
+    return entry if isinstance(entry, dict) else None
+
+def refresh_headlines(topic):
+    """Fetch a "country:category" topic from NewsAPI and merge it into the topic's cached set."""
+    country_code, category = topic.split(':', 1)
+    with stage('newsapi'):
+        fresh = load_headlines(country_code, category)
+    entry = _headline_entry(topic)
+    articles = merge_headlines(
+        entry['articles'] if entry else [], fresh,
+        max_items=config.HEADLINE_SET_SIZE,
+        max_age_hours=config.HEADLINE_MAX_AGE_HOURS,
+    )
+    # The set outlives HEADLINE_CACHE_TTL so later refreshes merge into it
+    headline_cache.set(topic, {'articles': articles, 'refreshed_at': time.time()},
+                       config.HEADLINE_MAX_AGE_HOURS * 3600)
+    return articles
+
+def cached_headlines(topic):
+    """A topic's merged headline set, refreshed when older than HEADLINE_CACHE_TTL."""
+    entry = _headline_entry(topic)
+    if entry and time.time() - entry['refreshed_at'] < config.HEADLINE_CACHE_TTL:
+        print(f"⚡ Headlines cache hit: {topic}")
+        return entry['articles']
+    try:
+        return refresh_headlines(topic)
+    except Exception as e:
+        if not entry:
+            raise
+        print(f"⚠️ Headline refresh failed for {topic}, serving previous set: {e}")
+        return entry['articles']
+
+# One upstream refresh per topic is pushed to every subscriber
+headline_hub = HeadlineHub(
+    load=cached_headlines,
+    refresh=refresh_headlines,
+    interval=config.PUSH_INTERVAL,
+    max_subscribers=config.PUSH_MAX_SUBSCRIBERS,
+)
+
 # =============================================================================
 # FLASK ROUTES - MAIN APP
 # =============================================================================
 
+def _text_param(data, name, default):
+    """A string parameter from the query string or JSON body."""
+    value = data.get(name) or default
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+def _int_param(data, name, default):
+    """A whole-number parameter; JSON lists, objects and booleans are rejected."""
+    value = data.get(name) or default
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"{name} must be a whole number")
+
 # --- NEWS API ENDPOINT ---
-@app.route('/api/news', methods=['POST'])
+@app.route('/api/news', methods=['GET', 'POST'])
 def fetch_news_api():
     try:
-        data = request.get_json()
-        country_code = data.get('country', 'us').lower()
-        category = data.get('category', 'general').lower() 
-        
-        top_headlines = newsapi.get_top_headlines(
-            category=category,
-            country=country_code,
-            language='en',
-            page_size=20,
-        )
-
-        articles = []
-        for article in top_headlines.get('articles', []):
-            published_at = article.get('publishedAt', '')
-            
-            try:
-                published_date_fmt = datetime.strptime(published_at[:10], '%Y-%m-%d').strftime('%b %d, %Y')
-            except ValueError:
-                published_date_fmt = "Recent"
-            
-            raw_description = article.get('description')
-            if raw_description:
-                processed_description = raw_description.split('.')[0].strip() + '...'
-            else:
-                processed_description = 'Click to read the full article.'
-
-            articles.append({
-                'title': article.get('title', 'No Title'),
-                'source': article.get('source', {}).get('name', 'Unknown'),
-                'description': processed_description,
-                'url': article.get('url'),
-                'image': article.get('urlToImage'),
-                'published': published_date_fmt
-            })
+        # GET (query string) is cacheable by browsers and CDNs; POST is kept for older clients
+        data = request.get_json(silent=True) or request.args
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Request body must be a JSON object'}), 400
+        
+        # Paging: "cursor" from the previous page's next_cursor, "limit" articles, optional "fields"
+        try:
+            country_code = _text_param(data, 'country', 'us').lower()
+            category = _text_param(data, 'category', 'general').lower()
+            limit = min(max(_int_param(data, 'limit', config.HEADLINE_PAGE_SIZE), 1), config.HEADLINE_MAX_PAGE_SIZE)
+            fields = parse_fields(data.get('fields'))
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        
+        articles = cached_headlines(f"{country_code}:{category}")
         
         if not articles:
-            return jsonify({
+            return conditional_json({
                 'status': 'ok', 
                 'articles': [], 
                 'count': 0, 
-                'message': 'No headlines found for these filters.'
-            })
+                'total': 0,
+                'next_cursor': None,
+                'message': 'No headlines found for these filters.',
+                'version': headline_version([])
+            }, max_age=config.HEADLINE_CACHE_TTL)
 
-        return jsonify({
+        try:
+            page, next_cursor = paginate(articles, data.get('cursor'), limit, fields)
+        except CursorError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+
+        return conditional_json({
             'status': 'ok',
-            'articles': articles,
-            'count': len(articles),
-            'filters': {'country': country_code.upper(), 'category': category.title()}
-        })
+            'articles': page,
+            'count': len(page),
+            'total': len(articles),
+            'next_cursor': next_cursor,
+            'filters': {'country': country_code.upper(), 'category': category.title()},
+            # Pass to /api/news/stream as "since" to only receive later changes
+            'version': headline_version(articles)
+        }, max_age=config.HEADLINE_CACHE_TTL)
 
     except Exception as e:
         print(f"Error fetching NewsAPI: {e}")
@@ -321,11 +365,103 @@ def fetch_news_api():
             'message': f'API connection failed: {str(e)}'
         }), 500
 
+# --- LIVE HEADLINES (Server-Sent Events) ---
+@app.route('/api/news/stream', methods=['GET'])
+def stream_news():
+    country_code = request.args.get('country', 'us').lower()
+    category = request.args.get('category', 'general').lower()
+    if country_code not in COUNTRIES or category.title() not in CATEGORIES:
+        return jsonify({'status': 'error', 'message': 'Unknown country or category'}), 400
+    
+    if not request.environ.get('wsgi.multithread'):
+        # A single-threaded worker (gunicorn sync, serve.py --threads 1) would
+        # spend its only request slot on the stream until the arbiter kills it
+        return jsonify({
+            'status': 'error',
+            'message': 'Live headlines need a threaded server; poll /api/news instead'
+        }), 503
+    
+    topic = f"{country_code}:{category}"
+    # EventSource resends the last event id when it reconnects
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    
+    try:
+        subscription = headline_hub.subscribe(topic)
+    except Exception as e:
+        print(f"Error subscribing to {topic}: {e}")
+        return jsonify({'status': 'error', 'message': 'Live headlines are unavailable'}), 500
+    
+    if subscription is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Too many live subscribers; poll /api/news instead'
+        }), 503
+    events, articles, version = subscription
+    
+    def generate():
+        try:
+            if since != version:
+                page, next_cursor = paginate(articles, limit=config.HEADLINE_PAGE_SIZE)
+                yield sse_event('snapshot', {
+                    'articles': page,
+                    'next_cursor': next_cursor,
+                    'total': len(articles),
+                    'version': version
+                }, version)
+            
+            # Streams are recycled now and then so server threads are not held forever
+            stop_at = time.monotonic() + config.PUSH_STREAM_SECONDS
+            while True:
+                remaining = stop_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = events.get(timeout=min(config.PUSH_HEARTBEAT, remaining))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_event('diff', event, event['version'])
+        finally:
+            headline_hub.unsubscribe(topic, events)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+# --- IMAGE PROXY ---
+@app.route('/img', methods=['GET'])
+def image_thumbnail():
+    import image_proxy
+    
+    url = request.args.get('u', '')
+    if not image_proxy.verify(url, request.args.get('s', '')):
+        return jsonify({'status': 'error', 'message': 'Invalid image signature'}), 403
+    if not image_proxy.enabled():
+        return redirect(url)
+    
+    fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+    data = image_proxy.get_thumbnail(url, fmt)
+    if data is None:
+        # The card shows its "No Image Available" placeholder
+        response = jsonify({'status': 'error', 'message': 'Image unavailable'})
+        response.status_code = 404
+        response.cache_control.max_age = image_proxy.FAILURE_TTL
+        return response
+    
+    response = Response(data, mimetype=image_proxy.FORMATS[fmt][1])
+    # Cache key doubles as the ETag; http_cache answers If-None-Match with 304
+    response.set_etag(image_proxy.cache_key(url, fmt))
+    response.cache_control.public = True
+    response.cache_control.max_age = config.IMAGE_MAX_AGE
+    response.vary.add('Accept')
+    return response
+
 # --- SUMMARIZATION ENDPOINT ---
-@app.route('/api/summarize', methods=['POST'])
+@app.route('/api/summarize', methods=['GET', 'POST'])
 def summarize_article():
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or request.args
         url = data.get('url')
         title = data.get('title', 'Article')
         
@@ -338,9 +474,41 @@ def summarize_article():
                 'message': 'No URL provided'
             }), 400
         
+        cached = summary_cache.get(url)
+        if cached:
+            print("⚡ Summary cache hit")
+            return conditional_json({
+                'status': 'ok',
+                'summary': cached['summary'],
+                'title': title,
+                'word_count': len(cached['summary'].split()),
+                'source': cached.get('source', 'ai')
+            }, max_age=config.SUMMARY_CACHE_TTL)
+        
+        # One time budget for fetch, extraction and the LLM call
+        deadline = request_deadline(config.SUMMARIZE_DEADLINE, data)
+        
         # Enhanced text extraction
         print("Step 1: Robust text extraction...")
-        article_text = extract_article_text_robust(url)
+        cached_article = article_cache.get(url)
+        if cached_article:
+            article_text = cached_article['text']
+        else:
+            article_text = extract_article_text_robust(url, deadline)
+            if article_text:
+                article_cache.set(url, {'text': article_text}, config.SUMMARY_CACHE_TTL)
+        
+        # An expired summary beats none (or one made of extracted sentences)
+        stale = summary_cache.get(url, stale=True)
+        if not article_text and stale:
+            print("⏱️ Serving expired cached summary")
+            return jsonify({
+                'status': 'ok',
+                'summary': stale['summary'],
+                'title': title,
+                'word_count': len(stale['summary'].split()),
+                'source': 'stale_cache'
+            })
         
         if not article_text:
             print("❌ Text extraction failed")
@@ -354,16 +522,28 @@ def summarize_article():
         
         # Generate reliable summary with fallbacks
         print("Step 2: Generating summary with fallbacks...")
-        summary = generate_reliable_summary(article_text, title, url)
+        summary, source = generate_reliable_summary(article_text, title, url, deadline)
         
-        print(f"✅ Summary generated: {len(summary.split())} words")
+        if source != 'ai' and stale and stale.get('source', 'ai') == 'ai':
+            print("⏱️ Serving expired AI summary instead of extracted sentences")
+            summary, source = stale['summary'], 'stale_cache'
         
-        return jsonify({
+        print(f"✅ Summary generated: {len(summary.split())} words ({source})")
+        # Facts are stored with the summary so quizzes can be built from both
+        ttl = config.SUMMARY_CACHE_TTL if source == 'ai' else config.FALLBACK_SUMMARY_TTL
+        summary_cache.set(url, {
+            'summary': summary,
+            'facts': extract_key_facts(article_text),
+            'source': 'ai' if source == 'stale_cache' else source
+        }, ttl)
+        
+        return conditional_json({
             'status': 'ok',
             'summary': summary,
             'title': title,
-            'word_count': len(summary.split())
-        })
+            'word_count': len(summary.split()),
+            'source': source
+        }, max_age=ttl)
     
     except Exception as e:
         print(f"❌ Summarization error: {e}")
@@ -376,16 +556,18 @@ def summarize_article():
 # --- TEST ENDPOINT ---
 @app.route('/api/test-key', methods=['GET'])
 def test_api_key():
+    import requests
+    
     try:
-        url = "https://openrouter.ai/api/v1/chat/completions"
+        url = config.OPENROUTER_URL
         
         headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
         }
         
         payload = {
-            "model": "google/gemini-2.0-flash-exp:free",
+            "model": config.OPENROUTER_MODEL,
             "messages": [{"role": "user", "content": "Say hello in one word"}],
             "max_tokens": 10
         }
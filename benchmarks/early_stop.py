@@ -0,0 +1,55 @@
+"""Check that the streaming fetcher's early stop never loses the article body.
+
+Serves each page layout from the news site stub (benchmarks/stubs.py), fetches
+it once with early stop and once in full, and runs both extractors on each.
+A layout fails when the early-stopped page extracts fewer words than the full
+one. Exits with status 1 on any failure.
+
+    python -m benchmarks.early_stop
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('EXTRACTION_WORKERS', '0')
+
+
+def word_count(result):
+    return result['word_count'] if result else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--article', type=int, default=7, help='article id to render in each layout')
+    args = parser.parse_args()
+
+    from benchmarks import stubs
+    from extraction import parse_article_html, parse_quiz_html
+    from fetcher import fetch_html
+
+    site = stubs.start_news_site()
+    failures = 0
+    print(f"{'layout':<14}{'streamed':>10}{'full':>10}{'summary words':>16}{'quiz words':>13}")
+    for layout in stubs.LAYOUTS:
+        url = f"{site.url}/article/{args.article}/{layout}"
+        streamed = fetch_html(url)
+        full = fetch_html(url, stop_early=False)
+
+        counts = []
+        for extract in (parse_article_html, parse_quiz_html):
+            got, expected = word_count(extract(streamed)), word_count(extract(full))
+            counts.append(f"{got}/{expected}")
+            if got < expected:
+                failures += 1
+        print(f"{layout:<14}{len(streamed) // 1024:>8}KB{len(full) // 1024:>8}KB{counts[0]:>16}{counts[1]:>13}")
+
+    site.shutdown()
+    print('FAILED' if failures else 'OK')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
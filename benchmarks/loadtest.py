@@ -0,0 +1,220 @@
+"""End-to-end load test against local stub upstreams.
+
+Starts the NewsAPI, OpenRouter and news-site stubs from benchmarks/stubs.py,
+launches the app with serve.py pointed at them, then drives /api/news,
+/api/summarize, /api/quiz/generate and /api/chat/send from concurrent clients
+and reports throughput, p50/p95/p99 latency and error rate per endpoint.
+
+    python -m benchmarks.loadtest --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --llm-latency-ms 800 --llm-429-rate 0.2 --workers 4
+    python -m benchmarks.loadtest --target http://127.0.0.1:8000   # existing server
+
+With --target the stubs are still started and their URLs printed; configure
+the target server with NEWSAPI_BASE_URL and OPENROUTER_URL yourself.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks import stubs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COUNTRIES = ['us', 'in', 'gb', 'au', 'jp', 'de', 'cn']
+CATEGORIES = ['general', 'business', 'technology', 'science', 'health', 'sports', 'entertainment']
+CHAT_MESSAGES = [
+    "What's happening with the election today?",
+    "whats happening with the election today",
+    "Explain the latest interest rate decision",
+    "Summarise today's technology news",
+    "What is the outlook for oil prices this week?",
+    "Who won the match last night?",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Scenario:
+    """Builds requests for each endpoint; article ids are drawn from a fixed pool."""
+
+    def __init__(self, base_url, site_url, article_pool, rng):
+        self.base_url = base_url
+        self.site_url = site_url
+        self.article_pool = article_pool
+        self.rng = rng
+
+    def article_url(self):
+        return f"{self.site_url}/article/{self.rng.randrange(self.article_pool)}"
+
+    def news(self, session):
+        return session.get(f"{self.base_url}/api/news", params={
+            'country': self.rng.choice(COUNTRIES), 'category': self.rng.choice(CATEGORIES)})
+
+    def summarize(self, session):
+        return session.get(f"{self.base_url}/api/summarize", params={'url': self.article_url(), 'title': 'Load test'})
+
+    def quiz(self, session):
+        return session.post(f"{self.base_url}/api/quiz/generate", json={'url': self.article_url()})
+
+    def chat(self, session):
+        return session.post(f"{self.base_url}/api/chat/send", json={'message': self.rng.choice(CHAT_MESSAGES)})
+
+
+def run_load(base_url, site_url, args):
+    weights = {'news': args.weight_news, 'summarize': args.weight_summarize,
+               'quiz': args.weight_quiz, 'chat': args.weight_chat}
+    endpoints = [name for name, weight in weights.items() if weight > 0]
+    endpoint_weights = [weights[name] for name in endpoints]
+
+    results = {name: [] for name in endpoints}   # (latency_s, ok, status)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + args.duration
+    remaining = [args.requests] if args.requests else None
+
+    def take_request():
+        if remaining is None:
+            return time.monotonic() < stop_at
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def client(seed):
+        rng = random.Random(seed)
+        scenario = Scenario(base_url, site_url, args.articles, rng)
+        session = requests.Session()
+        while take_request():
+            name = rng.choices(endpoints, endpoint_weights)[0]
+            start = time.perf_counter()
+            try:
+                response = getattr(scenario, name)(session)
+                ok = response.status_code < 400
+                if ok and response.status_code == 200:
+                    ok = response.json().get('status') == 'ok'
+                status = response.status_code
+            except requests.RequestException as e:
+                ok, status = False, type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                results[name].append((elapsed, ok, status))
+
+    threads = [threading.Thread(target=client, args=(args.seed + i,)) for i in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def report(results, wall_time):
+    print(f"\n{'endpoint':<12} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    all_latencies, total, failures = [], 0, 0
+    for name, rows in results.items():
+        latencies = [r[0] * 1000 for r in rows]
+        errors = sum(1 for r in rows if not r[1])
+        total += len(rows)
+        failures += errors
+        all_latencies += latencies
+        error_rate = errors / len(rows) if rows else 0
+        print(f"{name:<12} {len(rows):>8} {len(rows) / wall_time:>8.1f} {percentile(latencies, 50):>8.0f} "
+              f"{percentile(latencies, 95):>8.0f} {percentile(latencies, 99):>8.0f} {error_rate:>6.1%}")
+    print(f"{'total':<12} {total:>8} {total / wall_time:>8.1f} {percentile(all_latencies, 50):>8.0f} "
+          f"{percentile(all_latencies, 95):>8.0f} {percentile(all_latencies, 99):>8.0f} "
+          f"{(failures / total if total else 0):>6.1%}")
+
+    statuses = {}
+    for rows in results.values():
+        for _, ok, status in rows:
+            if not ok:
+                statuses[status] = statuses.get(status, 0) + 1
+    if statuses:
+        print("failures by status: " + ', '.join(f"{k}: {v}" for k, v in sorted(statuses.items(), key=str)))
+
+
+def start_app(args, newsapi, openrouter):
+    port = stubs.free_port()
+    env = dict(os.environ,
+               NEWSAPI_BASE_URL=newsapi.url,
+               OPENROUTER_URL=f'{openrouter.url}/api/v1/chat/completions',
+               IMAGE_ALLOW_PRIVATE='1',   # The news site stub serves images from 127.0.0.1
+               # All articles are on the one stub host; without this the
+               # per-host politeness limits cap the whole test
+               HOST_MIN_INTERVAL='0', HOST_MAX_CONCURRENCY='1000',
+               CACHE_PATH=os.path.join(tempfile.mkdtemp(), 'loadtest.sqlite3'))
+    log = open(os.path.join(tempfile.gettempdir(), 'loadtest_server.log'), 'w')
+    proc = subprocess.Popen(
+        [sys.executable, 'serve.py', '--workers', str(args.workers), '--threads', str(args.threads),
+         '--bind', f'127.0.0.1:{port}'],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    if stubs.wait_for(base_url + '/health'):
+        return proc, base_url, log.name
+    proc.terminate()
+    raise RuntimeError(f'server did not start, see {log.name}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', help='base URL of an already running server')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=20, help='seconds to run (ignored with --requests)')
+    parser.add_argument('--requests', type=int, help='total requests instead of a duration')
+    parser.add_argument('--articles', type=int, default=200, help='distinct article URLs (controls cache hit rate)')
+    parser.add_argument('--weight-news', type=float, default=4)
+    parser.add_argument('--weight-summarize', type=float, default=3)
+    parser.add_argument('--weight-quiz', type=float, default=1)
+    parser.add_argument('--weight-chat', type=float, default=2)
+    parser.add_argument('--llm-latency-ms', type=float, default=300)
+    parser.add_argument('--llm-ms-per-1k-tokens', type=float, default=200)
+    parser.add_argument('--llm-429-rate', type=float, default=0.0)
+    parser.add_argument('--newsapi-latency-ms', type=float, default=50)
+    parser.add_argument('--site-latency-ms', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    site = stubs.start_news_site(latency_ms=args.site_latency_ms)
+    newsapi = stubs.start_newsapi(site.url, latency_ms=args.newsapi_latency_ms)
+    openrouter = stubs.start_openrouter(latency_ms=args.llm_latency_ms, ms_per_1k_tokens=args.llm_ms_per_1k_tokens,
+                                        rate_429=args.llm_429_rate, seed=args.seed)
+    print(f"Stubs: NewsAPI {newsapi.url}  OpenRouter {openrouter.url}  site {site.url}")
+
+    proc = None
+    if args.target:
+        base_url = args.target.rstrip('/')
+    else:
+        proc, base_url, log_path = start_app(args, newsapi, openrouter)
+        print(f"App: {base_url} ({args.workers} workers x {args.threads} threads, log: {log_path})")
+
+    try:
+        print(f"Driving {args.concurrency} clients for "
+              f"{f'{args.requests} requests' if args.requests else f'{args.duration:.0f}s'}...")
+        results, wall_time = run_load(base_url, site.url, args)
+        report(results, wall_time)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+        for server in (site, newsapi, openrouter):
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
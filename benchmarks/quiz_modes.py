@@ -0,0 +1,107 @@
+"""Compare quiz generation from full article text vs. a stored summary + key facts.
+
+For each article it reports the prompt size sent to the LLM (estimated tokens),
+the latency of generate_quiz, and with ``--live`` a grounding score: the share
+of correct answers whose text actually appears in the original article.
+
+By default the LLM is the OpenRouter stub from benchmarks/stubs.py, which
+answers after a delay proportional to the prompt size (``--ms-per-1k-tokens``)
+with questions built from the prompt by the local quiz generator. Those
+answers are grounded by construction, so the stub run only compares prompt
+size and latency. Pass ``--live`` to call
+the configured OpenRouter endpoint and score quality as well.
+
+    python -m benchmarks.quiz_modes
+    python -m benchmarks.quiz_modes --live article1.txt article2.txt
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+SAMPLE_ARTICLES = [
+    """The European Central Bank raised interest rates by 0.25 percent on Thursday, its tenth consecutive increase since July 2022. President Christine Lagarde said inflation in the eurozone remained too high at 5.3 percent in August, well above the bank's 2 percent target. Economists at Deutsche Bank had expected the decision, while analysts at Goldman Sachs predicted a pause. The bank now forecasts growth of 0.7 percent for 2023 and 1.0 percent for 2024, down from earlier projections. Markets in Frankfurt and Paris fell sharply after the announcement, with the DAX index losing 1.2 percent by the close of trading. The next policy meeting is scheduled for October 26 in Athens, where officials will review fresh data on wages and energy prices. Lagarde told reporters in Frankfurt that the governing council was not yet done and would keep rates restrictive for as long as necessary. Officials in Berlin welcomed the move, saying price stability was essential for German households facing higher rents and food bills. Around 350 million people use the euro across 20 countries, and the currency weakened against the dollar after the decision. Critics in Rome and Madrid warned that higher borrowing costs could push southern economies toward recession in the coming months.""",
+    """NASA confirmed on Monday that its Artemis II mission will launch no earlier than September 2025, a delay of almost a year from the original schedule. The crew of four astronauts, including Canadian Jeremy Hansen, will fly around the Moon aboard the Orion spacecraft without landing. Administrator Bill Nelson said engineers needed more time to study heat shield damage found after the uncrewed Artemis I flight in December 2022. The Space Launch System rocket, which costs about $4.1 billion per launch, will lift off from Kennedy Space Center in Florida. The agency also pushed the Artemis III landing to 2026, when astronauts are expected to touch down near the lunar south pole. SpaceX is building the Starship lander for that mission under a $2.9 billion contract awarded in 2021. Lawmakers in Washington questioned whether the program could stay on budget after an inspector general report estimated total spending of $93 billion through 2025. Nelson told reporters in Houston that safety would remain the top priority for every crewed flight. The mission will last about 10 days and travel more than 370,000 kilometers from Earth. Officials in Ottawa said Canada remained fully committed to the partnership.""",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English)."""
+    return max(1, len(text) // 4)
+
+
+def grounding(quiz, article):
+    """Share of correct answers that appear verbatim in the article."""
+    questions = (quiz or {}).get('questions', [])
+    if not questions:
+        return 0.0
+    hits = 0
+    for question in questions:
+        try:
+            answer = question['options'][question['correct']]
+        except (KeyError, IndexError, TypeError):
+            continue
+        hits += answer.lower() in article.lower()
+    return hits / len(questions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('articles', nargs='*', help='text files with article bodies (defaults to built-in samples)')
+    parser.add_argument('--live', action='store_true', help='call the configured OpenRouter endpoint')
+    parser.add_argument('--ms-per-1k-tokens', type=float, default=800, help='stub LLM latency per 1k prompt tokens')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if not args.live:
+        from benchmarks import stubs
+        stub = stubs.start_openrouter(latency_ms=0, ms_per_1k_tokens=args.ms_per_1k_tokens)
+        os.environ['OPENROUTER_URL'] = f'{stub.url}/api/v1/chat/completions'
+
+    # Imported after OPENROUTER_URL is set so config picks it up
+    import io
+    import contextlib
+    import app
+    import quiz
+    from local_quiz import extract_key_facts
+
+    articles = [open(path, encoding='utf-8').read() for path in args.articles] or SAMPLE_ARTICLES
+
+    rows = {'full': [], 'summary': []}
+    for article in articles:
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = app.generate_reliable_summary(article, 'Article', 'benchmark')
+        contexts = {
+            'full': article,
+            'summary': quiz.format_summary_context({'summary': summary, 'facts': extract_key_facts(article)}),
+        }
+        for mode, content in contexts.items():
+            tokens = estimate_tokens(quiz.build_quiz_prompt(content, 'Article'))
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    quiz_data = quiz.generate_quiz(content, 'Article')
+                elapsed = (time.perf_counter() - start) * 1000
+                rows[mode].append((tokens, elapsed, grounding(quiz_data, article), (quiz_data or {}).get('generator')))
+
+    print(f"LLM: {'OpenRouter (live)' if args.live else 'local stub'}, {len(articles)} articles x {args.runs} runs\n")
+    print(f"{'mode':>8} {'prompt tokens':>14} {'latency ms':>11} {'grounded':>9}  generators")
+    for mode, results in rows.items():
+        generators = sorted({r[3] for r in results if r[3]})
+        # The stub's answers come from the prompt itself, so grounding says nothing there
+        grounded = f"{statistics.mean(r[2] for r in results):>8.0%}" if args.live else f"{'n/a':>8}"
+        print(f"{mode:>8} {statistics.mean(r[0] for r in results):>14.0f} "
+              f"{statistics.median(r[1] for r in results):>11.1f} "
+              f"{grounded}  {', '.join(generators)}")
+
+    full_tokens = statistics.mean(r[0] for r in rows['full'])
+    summary_tokens = statistics.mean(r[0] for r in rows['summary'])
+    print(f"\nSummary mode sends {1 - summary_tokens / full_tokens:.0%} fewer prompt tokens")
+
+
+if __name__ == '__main__':
+    main()
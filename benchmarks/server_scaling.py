@@ -0,0 +1,88 @@
+"""Requests/sec of the production server as the worker count grows.
+
+Serves an article from the news site stub (benchmarks/stubs.py), points
+OpenRouter at a closed port (so summaries fall back to the local extractor
+immediately) and drives /api/summarize with unique URLs so every request does
+a full fetch and BeautifulSoup parse.
+
+    python -m benchmarks.server_scaling --workers 1 2 4 --requests 400 --concurrency 16
+"""
+import argparse
+import functools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import stubs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def post_json(url, data):
+    req = urllib.request.Request(url, data=json.dumps(data).encode(), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        resp.read()
+        return resp.status
+
+
+def run_level(workers, site_url, total, concurrency):
+    port = stubs.free_port()
+    env = dict(os.environ,
+               OPENROUTER_URL='http://127.0.0.1:9/',
+               # Every article is on 127.0.0.1; lift the per-host politeness
+               # limits so the benchmark measures CPU scaling, not the limits
+               HOST_MIN_INTERVAL='0', HOST_MAX_CONCURRENCY='1000',
+               CACHE_PATH=os.path.join(tempfile.mkdtemp(), 'bench.sqlite3'))
+    proc = subprocess.Popen(
+        [sys.executable, 'serve.py', '--workers', str(workers), '--threads', '1', '--bind', f'127.0.0.1:{port}'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base = f'http://127.0.0.1:{port}'
+        if not stubs.wait_for(base + '/health'):
+            raise RuntimeError('server did not start')
+
+        target = functools.partial(post_json, base + '/api/summarize')
+        payloads = [{'url': f'{site_url}?n={workers}-{i}', 'title': 'Bench'} for i in range(total)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            statuses = list(pool.map(target, payloads))
+        elapsed = time.perf_counter() - start
+
+        errors = sum(1 for s in statuses if s != 200)
+        return total / elapsed, errors
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    site = stubs.start_news_site()
+    # An <article>-only page (odd ids), so the summary comes from a BeautifulSoup parse
+    site_url = f'{site.url}/article/1'
+
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'errors':>7}")
+    baseline = None
+    for workers in args.workers:
+        rps, errors = run_level(workers, site_url, args.requests, args.concurrency)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.1f} {rps / baseline:>7.2f}x {errors:>7}")
+
+    site.shutdown()
+
+
+if __name__ == '__main__':
+    main()
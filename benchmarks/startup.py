@@ -0,0 +1,85 @@
+"""Cold-start report: import time of app.py, lazy vs eager loading.
+
+Runs ``python -X importtime -c "import app"`` in fresh interpreters and prints
+the total import time, the slowest top-level imports, and the time until the
+first /health response.
+
+    python -m benchmarks.startup --runs 5 --top 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+FIRST_REQUEST = (
+    "import time; t = time.perf_counter(); import app; "
+    "app.app.test_client().get('/health'); "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def import_profile(eager):
+    """Return (total_ms, {module imported by app: cumulative_ms}) for one cold import."""
+    env = dict(os.environ, EAGER_LOAD='1' if eager else '0')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    # importtime lists children before their parent; level-1 entries that
+    # precede the "app" line are the modules app.py imported directly
+    pending, children, total = {}, {}, 0.0
+    for match in IMPORTTIME_RE.finditer(result.stderr):
+        cumulative, indent, name = int(match.group(2)) / 1000, len(match.group(3)), match.group(4)
+        if indent == 3:
+            pending[name] = cumulative
+        elif indent == 1:
+            if name == 'app':
+                children, total = pending, cumulative
+            pending = {}
+    return total, children
+
+
+def first_request_ms(eager):
+    env = dict(os.environ, EAGER_LOAD='1' if eager else '0')
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def report(label, eager, runs, top):
+    totals, firsts, modules = [], [], {}
+    for _ in range(runs):
+        total, top_level = import_profile(eager)
+        totals.append(total)
+        firsts.append(first_request_ms(eager))
+        for name, ms in top_level.items():
+            modules.setdefault(name, []).append(ms)
+
+    print(f"\n{label}")
+    print(f"  import app      median {statistics.median(totals):8.1f} ms")
+    print(f"  first response  median {statistics.median(firsts):8.1f} ms")
+    print(f"  slowest imports:")
+    ranked = sorted(((statistics.median(v), k) for k, v in modules.items()), reverse=True)
+    for ms, name in ranked[:top]:
+        print(f"    {ms:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    report('Lazy loading (default)', False, args.runs, args.top)
+    report('Eager loading (EAGER_LOAD=1)', True, args.runs, args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""Local stand-ins for the upstream services, for benchmarks and load tests.
+
+- NewsAPI: ``/v2/top-headlines`` returning articles hosted on the news site stub
+- OpenRouter: ``/api/v1/chat/completions`` with configurable latency, 429 rate
+  and SSE streaming; answers summary, quiz and chat prompts plausibly
+- News site: ``/article/<n>`` pages of realistic size (``/article/<n>/<layout>``
+  for a specific layout) and ``/image/<n>.png``
+
+Each ``start_*`` function returns a running ThreadingHTTPServer; its ``url``
+attribute is the base URL. ``free_port`` and ``wait_for`` help the benchmarks
+that start serve.py in a subprocess.
+"""
+import http.server
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.request
+import zlib
+
+TOPICS = [
+    ('The European Central Bank', 'raised interest rates by {pct} percent', 'Frankfurt', 'Christine Lagarde'),
+    ('NASA', 'delayed its lunar mission to {month} {year}', 'Houston', 'Bill Nelson'),
+    ('The city council', 'approved a transit budget of ${amount} million', 'Chicago', 'Brandon Johnson'),
+    ('Toyota', 'recalled {count},000 vehicles over a software fault', 'Tokyo', 'Koji Sato'),
+    ('The World Health Organization', 'reported {count} new cases of avian flu', 'Geneva', 'Tedros Ghebreyesus'),
+]
+MONTHS = ['January', 'March', 'May', 'July', 'September', 'November']
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The fetcher closes article downloads early once the body has arrived
+        pass
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+def _serve(handler):
+    server = _Server(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, timeout=30):
+    """Poll ``url`` until it answers; False when it has not within ``timeout`` seconds."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload, headers=None):
+        self.send_body(status, json.dumps(payload).encode(), 'application/json', headers)
+
+    def log_message(self, *args):
+        pass
+
+
+# =============================================================================
+# NEWS SITE
+# =============================================================================
+
+def article_facts(n):
+    """Deterministic facts for article ``n``."""
+    rng = random.Random(n)
+    subject, action, city, person = TOPICS[n % len(TOPICS)]
+    action = action.format(pct=rng.choice(['0.25', '0.5', '0.75']), month=rng.choice(MONTHS),
+                           year=rng.randint(2024, 2027), amount=rng.randint(120, 980), count=rng.randint(12, 95))
+    return subject, action, city, person, rng
+
+
+LAYOUTS = ('article', 'json_ld', 'graph', 'second_block', 'teaser')
+
+
+def article_html(n, paragraphs=40, boilerplate_links=300, layout=None):
+    """A news page: navigation boilerplate, optional JSON-LD and an <article>.
+
+    ``layout`` picks where the body lives; by default even pages carry a
+    JSON-LD ``articleBody`` and odd ones only the <article>. The other layouts
+    are ones the streaming fetcher must not stop early on:
+    - ``graph``: Yoast-style ``@graph`` with the body in a NewsArticle node
+    - ``second_block``: a breadcrumb block first, the body in a later block
+    - ``teaser``: a short teaser <article> before the boilerplate and the real one
+    """
+    subject, action, city, person, rng = article_facts(n)
+    sentences = [
+        f"{subject} {action} on Tuesday, officials in {city} confirmed.",
+        f"{person} told reporters the decision followed months of review and {rng.randint(3, 40)} public hearings.",
+        f"Analysts said the move could affect about {rng.randint(2, 90)} million people over the next {rng.randint(2, 9)} years.",
+        f"Critics warned that costs might rise by {rng.randint(5, 35)} percent before {rng.choice(MONTHS)} {rng.randint(2025, 2028)}.",
+        f"Supporters in {city} welcomed the announcement and called for faster implementation.",
+    ]
+    texts = [' '.join(rng.sample(sentences, 4)) for _ in range(paragraphs)]
+    body = ''.join(f"<p>{text}</p>" for text in texts)
+    nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(boilerplate_links))
+    if layout is None:
+        layout = 'json_ld' if n % 2 == 0 else 'article'
+
+    article = {'@type': 'NewsArticle', 'headline': f'{subject} {action}', 'articleBody': ' '.join(texts)}
+    blocks = []
+    if layout == 'json_ld':
+        blocks = [article]
+    elif layout == 'graph':
+        blocks = [{'@context': 'https://schema.org', '@graph': [
+            {'@type': 'WebPage', 'name': f'{subject} {action}'},
+            {'@type': 'Person', 'name': person},
+            article,
+        ]}]
+    elif layout == 'second_block':
+        blocks = [{'@type': 'BreadcrumbList', 'itemListElement': [{'@type': 'ListItem', 'position': 1, 'name': 'News'}]},
+                  {'@type': 'Organization', 'name': f'{city} Daily'},
+                  article]
+    json_ld = ''.join(f'<script type="application/ld+json">{json.dumps(block)}</script>' for block in blocks)
+    teaser = ''
+    if layout == 'teaser':
+        teaser = f"<article class='teaser'><h2>Also today</h2><p>{sentences[4]}</p></article>"
+
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>{subject} {action}</title>"
+            f"<meta name='description' content='{subject} {action}.'>{json_ld}</head>"
+            f"<body>{teaser}<header><nav><ul>{nav}</ul></nav></header>"
+            f"<article><h1>{subject} {action}</h1>{body}</article>"
+            f"<footer>{'<p>Related links and subscription offers.</p>' * 50}</footer></body></html>")
+
+
+def _png(width, height, seed):
+    """A valid RGB PNG with noisy pixels (so it does not compress to nothing)."""
+    rng = random.Random(seed)
+    rows = b''.join(b'\x00' + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return (len(data).to_bytes(4, 'big') + kind + data
+                + (zlib.crc32(kind + data) & 0xffffffff).to_bytes(4, 'big'))
+
+    header = width.to_bytes(4, 'big') + height.to_bytes(4, 'big') + b'\x08\x02\x00\x00\x00'
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+def start_news_site(latency_ms=0, image_size=(640, 360)):
+    pages = {}
+    images = {}
+    lock = threading.Lock()
+
+    class Handler(_Handler):
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            match = re.match(r'/article/(\d+)(?:/(\w+))?', self.path)
+            if match and match.group(2) in (None,) + LAYOUTS:
+                key = (int(match.group(1)), match.group(2))
+                with lock:
+                    if key not in pages:
+                        pages[key] = article_html(key[0], layout=key[1]).encode('utf-8')
+                return self.send_body(200, pages[key], 'text/html; charset=utf-8')
+
+            match = re.match(r'/image/(\d+)\.png', self.path)
+            if match:
+                n = int(match.group(1)) % 8
+                with lock:
+                    if n not in images:
+                        images[n] = _png(*image_size, seed=n)
+                return self.send_body(200, images[n], 'image/png', {'Cache-Control': 'max-age=3600'})
+
+            self.send_body(404, b'not found', 'text/plain')
+
+    return _serve(Handler)
+
+
+# =============================================================================
+# NEWSAPI
+# =============================================================================
+
+def start_newsapi(site_url, articles_per_topic=20, latency_ms=50):
+    class Handler(_Handler):
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            if not self.path.startswith('/v2/top-headlines'):
+                return self.send_json(404, {'status': 'error', 'code': 'notFound'})
+
+            # Different country/category combinations get different (stable) article ids
+            offset = zlib.crc32(self.path.split('?', 1)[-1].encode()) % 1000
+            minute = int(time.time() // 60)
+            articles = []
+            for i in range(articles_per_topic):
+                n = offset + i
+                subject, action, city, _, _ = article_facts(n)
+                articles.append({
+                    'source': {'id': None, 'name': f'{city} Daily'},
+                    'title': f'{subject} {action}',
+                    'description': f'{subject} {action}. Officials in {city} confirmed the decision.',
+                    'url': f'{site_url}/article/{n}',
+                    'urlToImage': f'{site_url}/image/{n}.png',
+                    'publishedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime((minute - i) * 60)),
+                })
+            self.send_json(200, {'status': 'ok', 'totalResults': len(articles), 'articles': articles})
+
+    return _serve(Handler)
+
+
+# =============================================================================
+# OPENROUTER
+# =============================================================================
+
+def _answer(prompt):
+    """Plausible reply for the app's summary, quiz and chat prompts."""
+    content = re.search(r'Content: (.*?)\n\n(?:Return ONLY|Summary:)', prompt, re.DOTALL)
+    if prompt.startswith('Summarize') and content:
+        return ' '.join(re.split(r'(?<=[.!?])\s+', content.group(1))[:3])
+    if 'multiple-choice questions' in prompt and content:
+        from local_quiz import generate_local_quiz
+        return json.dumps(generate_local_quiz(content.group(1)) or {'questions': []})
+    return f"Here is a short answer about: {prompt[:80]}. Markets were mixed and officials promised an update soon."
+
+
+def start_openrouter(latency_ms=300, ms_per_1k_tokens=0, rate_429=0.0, seed=None):
+    """Chat-completions stub.
+
+    ``latency_ms`` is the base response time, ``ms_per_1k_tokens`` adds time per
+    prompt size, and ``rate_429`` is the share of requests rejected as rate limited.
+    Requests with ``"stream": true`` get SSE chunks.
+    """
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class Handler(_Handler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            with rng_lock:
+                limited = rng.random() < rate_429
+            if limited:
+                return self.send_json(429, {'error': {'code': 429, 'message': 'Rate limit exceeded: free-models-per-day'}},
+                                      {'Retry-After': '1'})
+
+            prompt = body.get('messages', [{}])[-1].get('content', '')
+            time.sleep((latency_ms + len(prompt) / 4000 * ms_per_1k_tokens) / 1000)
+            answer = _answer(prompt)
+
+            if not body.get('stream'):
+                return self.send_json(200, {
+                    'id': 'stub', 'model': body.get('model'),
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': answer}, 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(answer) // 4},
+                })
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for word in re.findall(r'\S+\s*', answer):
+                event = {'choices': [{'index': 0, 'delta': {'content': word}}]}
+                self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+                time.sleep(0.005)
+            self._chunk(b"data: [DONE]\n\n")
+            self._chunk(b'')
+
+        def _chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    return _serve(Handler)
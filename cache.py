@@ -0,0 +1,126 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+# =============================================================================
+# SHARED LOCAL CACHE
+# =============================================================================
+# A small TTL key/value store backed by a single SQLite file. Every worker
+# process on the host opens the same file, so a headline list or summary
+# computed by one worker is served by all of them. Rows long past their
+# expiry are purged every CACHE_PURGE_EVERY writes so the file stays bounded.
+
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+class SharedCache:
+    def __init__(self, path=None, namespace='default'):
+        self.path = path or config.CACHE_PATH
+        self.namespace = namespace
+        self._local = threading.local()
+
+    def _connection(self):
+        """One connection per thread and per process (connections must not cross a fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+            ' expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))'
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, default=None, stale=False):
+        """Return the cached value, or ``default`` when missing or expired.
+
+        With ``stale=True`` expired rows that have not been purged yet are returned
+        too (a last resort when fresh data cannot be produced in time).
+        """
+        try:
+            row = self._connection().execute(
+                'SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache read error: {e}")
+            return default
+
+        if not row or (row[1] < time.time() and not stale):
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """Store a JSON-serialisable value for ``ttl`` seconds."""
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (self.namespace, key, json.dumps(value), time.time() + ttl)
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache write error: {e}")
+            return
+        self._count_write()
+
+    def _count_write(self):
+        global _writes
+        with _writes_lock:
+            _writes += 1
+            due = config.CACHE_PURGE_EVERY > 0 and _writes % config.CACHE_PURGE_EVERY == 0
+        if due:
+            self.purge_expired(grace=config.CACHE_STALE_GRACE)
+
+    def add(self, key, value, ttl):
+        """Store only if ``key`` is missing or expired; True when this call stored it.
+
+        Usable as a lease shared by all worker processes.
+        """
+        try:
+            conn = self._connection()
+            conn.execute(
+                'DELETE FROM cache WHERE namespace = ? AND key = ? AND expires_at < ?',
+                (self.namespace, key, time.time())
+            )
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (self.namespace, key, json.dumps(value), time.time() + ttl)
+            )
+            return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache write error: {e}")
+            return False
+
+    def delete(self, key):
+        try:
+            self._connection().execute(
+                'DELETE FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache delete error: {e}")
+
+    def purge_expired(self, grace=0):
+        """Drop rows from every namespace that expired more than ``grace`` seconds ago."""
+        try:
+            cursor = self._connection().execute('DELETE FROM cache WHERE expires_at < ?', (time.time() - grace,))
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache purge error: {e}")
+            return
+        if cursor.rowcount:
+            print(f"🧹 Shared cache: purged {cursor.rowcount} expired entries")
+
+
+headline_cache = SharedCache(namespace='headlines')
+summary_cache = SharedCache(namespace='summaries')
+article_cache = SharedCache(namespace='articles')
+lease_cache = SharedCache(namespace='leases')
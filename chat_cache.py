@@ -0,0 +1,162 @@
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import config
+
+# =============================================================================
+# SEMANTIC CHAT RESPONSE CACHE
+# =============================================================================
+# Messages are normalised and turned into hashed character n-gram vectors.
+# A lookup is one matrix-vector product against every cached message, so
+# "What's happening with the election today?" and "whats happening with the
+# election today" hit the same entry without another LLM call. A fuzzy hit
+# must also have the same content words, so "capital of austria" never gets
+# the cached answer for "capital of australia".
+
+NGRAM_SIZE = 3
+VECTOR_DIMS = 2048
+MIN_MESSAGE_CHARS = 8     # Very short messages are too ambiguous to match fuzzily
+
+
+def normalize_message(message):
+    """Lowercase, drop punctuation and collapse whitespace."""
+    message = message.lower().replace("'", '')
+    message = re.sub(r'[^\w\s]', ' ', message)
+    return re.sub(r'\s+', ' ', message).strip()
+
+
+STOPWORDS = frozenset("""
+    a an the is are was were be been am do does did can could would will should
+    what whats who whos how why when where which whose tell me us i my you your
+    please give show explain know about of in on at to for from with by and or
+    it its this that these those there any some much many latest current
+""".split())
+
+
+def content_words(normalized):
+    """Words that carry a message's meaning: everything but stopwords, plurals folded.
+
+    Character n-grams score "capital of austria" and "capital of australia" as
+    near-duplicates; a fuzzy match must also keep the same content words
+    (numbers included) so it only absorbs rewording, not a different subject.
+    """
+    words = set()
+    for word in normalized.split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.add(word)
+    return frozenset(words)
+
+
+def vectorize(normalized):
+    """L2-normalised hashed character n-gram counts for a normalised message."""
+    vector = np.zeros(VECTOR_DIMS, dtype=np.float32)
+    padded = f" {normalized} "
+    for i in range(len(padded) - NGRAM_SIZE + 1):
+        gram = padded[i:i + NGRAM_SIZE].encode('utf-8')
+        vector[zlib.crc32(gram) % VECTOR_DIMS] += 1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+class SemanticCache:
+    def __init__(self, max_entries=500, ttl=1800, threshold=0.9):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._matrix = np.zeros((max_entries, VECTOR_DIMS), dtype=np.float32)
+        self._active = np.zeros(max_entries, dtype=bool)
+        self._entries = OrderedDict()   # slot -> entry dict, in LRU order
+        self._exact = {}                # normalised message -> slot
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _free_slot(self, slot):
+        entry = self._entries.pop(slot)
+        self._exact.pop(entry['normalized'], None)
+        self._active[slot] = False
+
+    def _take_slot(self):
+        """Return an unused slot, evicting expired entries first and then the least recently used."""
+        now = time.time()
+        for slot in [s for s, e in self._entries.items() if e['expires_at'] < now]:
+            self._free_slot(slot)
+
+        free = np.flatnonzero(~self._active)
+        if len(free):
+            return int(free[0])
+
+        slot = next(iter(self._entries))
+        self._free_slot(slot)
+        return slot
+
+    def lookup(self, message):
+        """Return ``{'response', 'similarity', 'matched'}`` for a near-duplicate message, or None."""
+        normalized = normalize_message(message)
+        if not normalized:
+            return None
+
+        with self._lock:
+            slot = self._exact.get(normalized)
+            similarity = 1.0
+
+            if slot is None and len(normalized) >= MIN_MESSAGE_CHARS and self._active.any():
+                scores = self._matrix @ vectorize(normalized)
+                scores[~self._active] = -1.0
+                best = int(np.argmax(scores))
+                if (scores[best] >= self.threshold
+                        and self._entries[best]['content_words'] == content_words(normalized)):
+                    slot, similarity = best, float(scores[best])
+
+            entry = self._entries.get(slot) if slot is not None else None
+            if entry is None or entry['expires_at'] < time.time():
+                if entry is not None:
+                    self._free_slot(slot)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            return {'response': entry['response'], 'similarity': round(similarity, 3), 'matched': entry['message']}
+
+    def store(self, message, response):
+        normalized = normalize_message(message)
+        if not normalized:
+            return
+
+        with self._lock:
+            slot = self._exact.get(normalized)
+            if slot is None:
+                slot = self._take_slot()
+            self._matrix[slot] = vectorize(normalized)
+            self._active[slot] = True
+            self._entries[slot] = {
+                'message': message,
+                'normalized': normalized,
+                'content_words': content_words(normalized),
+                'response': response,
+                'expires_at': time.time() + self.ttl,
+            }
+            self._entries.move_to_end(slot)
+            self._exact[normalized] = slot
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+response_cache = SemanticCache(
+    max_entries=config.CHAT_CACHE_SIZE,
+    ttl=config.CHAT_CACHE_TTL,
+    threshold=config.CHAT_CACHE_THRESHOLD,
+)
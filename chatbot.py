@@ -1,34 +1,26 @@
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 import requests
-import json
 import time
 
-# Create Blueprint for chatbot routes
-chatbot_bp = Blueprint('chatbot', __name__)
-
-print("=" * 60)
-print("🚀 CHATBOT - Rate Limit Aware Version!")
-print("=" * 60)
-
-# =============================================================================
-# CONFIGURATION
-# =============================================================================
-
-OPENROUTER_API_KEY = "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"
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
-MODEL = "google/gemini-2.0-flash-exp:free"
+import config
+from chat_cache import response_cache
+from deadline import request_deadline
+from profiling import stage
 
 # =============================================================================
 # RATE LIMIT AWARE CHATBOT
 # =============================================================================
 
+# Messages answered locally by generate_response; never served from the cache
+BUILTIN_MESSAGES = {'hello', 'hi', 'hey', 'help', 'what can you do', 'status', 'limit', 'rate limit', 'gemini'}
+
 class RateLimitAwareChatbot:
     def __init__(self):
         self.rate_limit_hit = False
         self.last_api_call = 0
         self.request_count = 0
     
-    def get_gemini_response(self, message):
+    def get_gemini_response(self, message, deadline=None):
         """Get response with rate limit handling"""
         
         # Check if we recently hit rate limit
@@ -38,15 +30,19 @@ class RateLimitAwareChatbot:
                 return None
         
         try:
+            timeout = 30
+            if deadline is not None:
+                timeout = deadline.timeout(cap=timeout, reserve=config.FALLBACK_RESERVE)
+            
             print(f"🤖 API Request #{self.request_count + 1}: '{message}'")
             
             headers = {
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                "Authorization": f"Bearer {config.CHATBOT_OPENROUTER_API_KEY}",
                 "Content-Type": "application/json",
             }
             
             payload = {
-                "model": MODEL,
+                "model": config.OPENROUTER_MODEL,
                 "messages": [
                     {
                         "role": "user",
@@ -57,7 +53,8 @@ class RateLimitAwareChatbot:
                 "max_tokens": 800,
             }
             
-            response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
+            with stage('llm'):
+                response = requests.post(config.OPENROUTER_URL, headers=headers, json=payload, timeout=timeout)
             self.request_count += 1
             self.last_api_call = time.time()
             
@@ -86,7 +83,7 @@ class RateLimitAwareChatbot:
             print(f"❌ API Exception: {e}")
             return None
     
-    def generate_response(self, message):
+    def generate_response(self, message, deadline=None):
         """Generate response with rate limit awareness"""
         if not message or message.strip() == "":
             return "👋 Hello! I'm your AI assistant. What would you like to know? 😊"
@@ -159,9 +156,10 @@ Available through Google AI Studio, Vertex AI, and APIs like OpenRouter.
 Gemini competes with other leading AI models like GPT-4 and Claude! 🚀"""
         
         # Try API first
-        api_response = self.get_gemini_response(message)
+        api_response = self.get_gemini_response(message, deadline)
         
         if api_response:
+            response_cache.store(message, api_response)
             return api_response
         
         # Rate limit or API failure response
@@ -201,14 +199,14 @@ The issue should resolve shortly! 🔧"""
 # Initialize chatbot
 chatbot = RateLimitAwareChatbot()
 
-def generate_chat_response(message, conversation_history=None):
-    return chatbot.generate_response(message)
+def generate_chat_response(message, conversation_history=None, deadline=None):
+    return chatbot.generate_response(message, deadline)
 
 # =============================================================================
 # FLASK ROUTES
 # =============================================================================
+# URL rules live in app.LAZY_ROUTES, which imports this module on first use
 
-@chatbot_bp.route('/api/chat/send', methods=['POST', 'OPTIONS'])
 def chat_send():
     """Main chat endpoint"""
     
@@ -234,13 +232,27 @@ def chat_send():
         
         print(f"💬 User message: '{message}'")
         
+        # Serve near-duplicate questions from the response cache
+        if message.lower().strip() not in BUILTIN_MESSAGES:
+            cached = response_cache.lookup(message)
+            if cached:
+                print(f"⚡ Chat cache hit (similarity {cached['similarity']})")
+                return jsonify({
+                    'status': 'ok',
+                    'response': cached['response'],
+                    'rate_limited': chatbot.rate_limit_hit,
+                    'cached': True,
+                    'similarity': cached['similarity']
+                }), 200
+        
         # Generate response
-        response = generate_chat_response(message)
+        response = generate_chat_response(message, deadline=request_deadline(config.CHAT_DEADLINE, data))
         
         return jsonify({
             'status': 'ok',
             'response': response,
-            'rate_limited': chatbot.rate_limit_hit
+            'rate_limited': chatbot.rate_limit_hit,
+            'cached': False
         }), 200
         
     except Exception as e:
@@ -250,21 +262,12 @@ def chat_send():
             'response': "👋 Hello! I'm your AI assistant. What would you like to know? 😊"
         }), 200
 
-@chatbot_bp.route('/api/chat/rate-limit-info', methods=['GET'])
 def rate_limit_info():
     """Get rate limit information"""
     return jsonify({
         'status': 'ok',
         'rate_limited': chatbot.rate_limit_hit,
         'request_count': chatbot.request_count,
+        'cache': response_cache.stats(),
         'message': 'Free daily limit: 50 requests. Reset every 24 hours.'
     }), 200
-
-print("="*60)
-print("🎯 RATE LIMIT AWARE CHATBOT READY!")
-print("  - POST /api/chat/send")
-print("  - GET  /api/chat/rate-limit-info")
-print("="*60)
-print("🚫 Currently: RATE LIMITED (free daily limit exceeded)")
-print("💡 Solutions: Wait 24h or add $10 credits to OpenRouter")
-print("="*60)
\ No newline at end of file
@@ -0,0 +1,190 @@
+import json
+import os
+import tempfile
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+# Settings are read once at import, in this order of precedence:
+#   1. environment variables
+#   2. the config file named by CONFIG_FILE (JSON or KEY=VALUE .env format),
+#      or config.json / .env next to this file
+#   3. the defaults below
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _read_config_file(path):
+    """Load settings from a JSON object or a KEY=VALUE file."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            raw = f.read()
+    except OSError:
+        return {}
+
+    if path.endswith('.json'):
+        try:
+            return {key: str(value) for key, value in json.loads(raw).items()}
+        except (ValueError, AttributeError) as e:
+            print(f"⚠️ Ignoring invalid config file {path}: {e}")
+            return {}
+
+    settings = {}
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, _, value = line.partition('=')
+        settings[key.strip()] = value.strip().strip('"\'')
+    return settings
+
+
+def _find_config_file():
+    if os.environ.get('CONFIG_FILE'):
+        return os.environ['CONFIG_FILE']
+    for name in ('config.json', '.env'):
+        path = os.path.join(BASE_DIR, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+CONFIG_FILE = _find_config_file()
+_FILE_SETTINGS = _read_config_file(CONFIG_FILE) if CONFIG_FILE else {}
+
+
+def _env(name, default, cast=str):
+    """Read a setting from the environment or config file, falling back to the default."""
+    value = os.environ.get(name)
+    if value is None or value == '':
+        value = _FILE_SETTINGS.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        print(f"⚠️ Invalid value for {name}: {value!r}, using {default!r}")
+        return default
+
+
+def _flag(value):
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# --- API KEYS ---
+NEWS_API_KEY = _env('NEWS_API_KEY', '')
+OPENROUTER_API_KEY = _env('OPENROUTER_API_KEY', '')
+QUIZ_OPENROUTER_API_KEY = _env('QUIZ_OPENROUTER_API_KEY', '')
+CHATBOT_OPENROUTER_API_KEY = _env('CHATBOT_OPENROUTER_API_KEY', '')
+
+# --- STARTUP ---
+# Import quiz/chatbot views and their dependencies at startup instead of on first request
+EAGER_LOAD = _env('EAGER_LOAD', False, _flag)
+
+# --- PRODUCTION SERVER ---
+BIND = _env('BIND', '0.0.0.0:8000')
+WORKERS = _env('WORKERS', os.cpu_count() or 1, int)
+THREADS = _env('THREADS', 4, int)
+WORKER_TIMEOUT = _env('WORKER_TIMEOUT', 60, int)
+GRACEFUL_TIMEOUT = _env('GRACEFUL_TIMEOUT', 30, int)
+KEEPALIVE = _env('KEEPALIVE', 5, int)
+MAX_REQUESTS = _env('MAX_REQUESTS', 1000, int)
+
+# --- PUBLISHER FETCHES ---
+# The per-host limits are for the whole server: each of the WORKERS processes
+# enforces its share (concurrency divided by WORKERS, but at least 1, and the
+# start interval multiplied by WORKERS). FETCH_MAX_CONCURRENCY is per process
+HOST_MAX_CONCURRENCY = _env('HOST_MAX_CONCURRENCY', 2, int)
+HOST_MIN_INTERVAL = _env('HOST_MIN_INTERVAL', 0.25, float)
+HOST_BACKOFF_MAX = _env('HOST_BACKOFF_MAX', 120, float)
+FETCH_MAX_CONCURRENCY = _env('FETCH_MAX_CONCURRENCY', 16, int)
+FETCH_QUEUE_TIMEOUT = _env('FETCH_QUEUE_TIMEOUT', 10, float)
+DNS_CACHE_TTL = _env('DNS_CACHE_TTL', 300, int)
+
+# --- HTML EXTRACTION PROCESS POOL (0 parses inline in the request thread) ---
+# Each server worker has its own pool; by default the pools together use one
+# process per CPU rather than one per CPU each
+EXTRACTION_WORKERS = _env('EXTRACTION_WORKERS', max(1, (os.cpu_count() or 1) // max(1, WORKERS)), int)
+EXTRACTION_TIMEOUT = _env('EXTRACTION_TIMEOUT', 20, int)
+
+# --- HEADLINE PUSH (Server-Sent Events, per worker process) ---
+# Each open stream holds one server thread, so by default at most half of a
+# worker's threads serve streams; raise THREADS to serve more subscribers.
+# serve.py applies its --threads value; single-threaded workers refuse streams
+PUSH_INTERVAL = _env('PUSH_INTERVAL', 300, int)
+PUSH_MAX_SUBSCRIBERS = _env('PUSH_MAX_SUBSCRIBERS', max(1, THREADS // 2), int)
+PUSH_STREAM_SECONDS = _env('PUSH_STREAM_SECONDS', 600, int)
+PUSH_HEARTBEAT = _env('PUSH_HEARTBEAT', 25, int)
+PUSH_QUEUE_SIZE = _env('PUSH_QUEUE_SIZE', 8, int)
+
+# --- REQUEST DEADLINES (seconds; clients may ask for their own, up to the max) ---
+SUMMARIZE_DEADLINE = _env('SUMMARIZE_DEADLINE', 10, float)
+QUIZ_DEADLINE = _env('QUIZ_DEADLINE', 15, float)
+CHAT_DEADLINE = _env('CHAT_DEADLINE', 20, float)
+MAX_REQUEST_DEADLINE = _env('MAX_REQUEST_DEADLINE', 30, float)
+# Time kept back from the LLM call so a local fallback still fits in the budget
+FALLBACK_RESERVE = _env('FALLBACK_RESERVE', 0.5, float)
+# Parse time a page cut off by the deadline still gets, so its partial text is used
+PARTIAL_PARSE_TIMEOUT = _env('PARTIAL_PARSE_TIMEOUT', 1.0, float)
+
+# --- SHARED CACHE (one SQLite file shared by all workers on the host) ---
+CACHE_PATH = _env('CACHE_PATH', os.path.join(tempfile.gettempdir(), 'news_digest_cache.sqlite3'))
+HEADLINE_CACHE_TTL = _env('HEADLINE_CACHE_TTL', 300, int)
+# Every CACHE_PURGE_EVERY writes a worker deletes rows expired for longer than
+# CACHE_STALE_GRACE (recently expired rows still serve deadline fallbacks)
+CACHE_PURGE_EVERY = _env('CACHE_PURGE_EVERY', 500, int)
+CACHE_STALE_GRACE = _env('CACHE_STALE_GRACE', 24 * 3600, int)
+
+# --- HEADLINE SET & PAGINATION ---
+# Each refresh fetches one large NewsAPI page and merges it into the topic's set
+HEADLINE_FETCH_SIZE = _env('HEADLINE_FETCH_SIZE', 100, int)
+HEADLINE_SET_SIZE = _env('HEADLINE_SET_SIZE', 200, int)
+HEADLINE_MAX_AGE_HOURS = _env('HEADLINE_MAX_AGE_HOURS', 48, int)
+HEADLINE_PAGE_SIZE = _env('HEADLINE_PAGE_SIZE', 20, int)
+HEADLINE_MAX_PAGE_SIZE = _env('HEADLINE_MAX_PAGE_SIZE', 50, int)
+SUMMARY_CACHE_TTL = _env('SUMMARY_CACHE_TTL', 6 * 3600, int)
+# Extracted-sentence summaries (AI failed or ran out of time) are retried sooner
+FALLBACK_SUMMARY_TTL = _env('FALLBACK_SUMMARY_TTL', 300, int)
+
+# --- QUIZ ---
+# Default source for quizzes: auto (stored summary if any, else full text), summary, full, local
+QUIZ_MODE = _env('QUIZ_MODE', 'auto')
+
+# --- CHATBOT RESPONSE CACHE (per worker process) ---
+CHAT_CACHE_SIZE = _env('CHAT_CACHE_SIZE', 500, int)
+CHAT_CACHE_TTL = _env('CHAT_CACHE_TTL', 1800, int)
+# Minimum n-gram similarity for a fuzzy hit; the content words must also match
+CHAT_CACHE_THRESHOLD = _env('CHAT_CACHE_THRESHOLD', 0.9, float)
+
+# --- IMAGE PROXY (headline thumbnails; needs Pillow) ---
+IMAGE_PROXY = _env('IMAGE_PROXY', True, _flag)
+# Signs /img URLs so the proxy only fetches images listed in our own headlines.
+# When unset, a random secret is generated once and kept in IMAGE_CACHE_DIR
+IMAGE_PROXY_SECRET = _env('IMAGE_PROXY_SECRET', '')
+# Only for local testing: let /img fetch from loopback and private addresses
+IMAGE_ALLOW_PRIVATE = _env('IMAGE_ALLOW_PRIVATE', False, _flag)
+IMAGE_CACHE_DIR = _env('IMAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'news_digest_images'))
+IMAGE_CACHE_MAX_BYTES = _env('IMAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024, int)
+IMAGE_WIDTH = _env('IMAGE_WIDTH', 640, int)
+IMAGE_HEIGHT = _env('IMAGE_HEIGHT', 360, int)
+IMAGE_QUALITY = _env('IMAGE_QUALITY', 75, int)
+IMAGE_FETCH_TIMEOUT = _env('IMAGE_FETCH_TIMEOUT', 5, float)
+IMAGE_MAX_BYTES = _env('IMAGE_MAX_BYTES', 15 * 1024 * 1024, int)
+IMAGE_MAX_AGE = _env('IMAGE_MAX_AGE', 7 * 24 * 3600, int)
+
+# --- PROFILING (opt-in) ---
+# Required for /admin/* and per-request profiles; empty disables both
+ADMIN_TOKEN = _env('ADMIN_TOKEN', '')
+# Continuous sampling of in-flight requests, in samples per second (0 = off)
+PROFILE_SAMPLE_HZ = _env('PROFILE_SAMPLE_HZ', 0, float)
+PROFILE_REQUEST_HZ = _env('PROFILE_REQUEST_HZ', 1000, float)
+PROFILE_DIR = _env('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'news_digest_profiles'))
+PROFILE_KEEP = _env('PROFILE_KEEP', 50, int)
+SLOW_REQUEST_MS = _env('SLOW_REQUEST_MS', 3000, int)
+# Send the Server-Timing header to every client, not just admin requests
+SERVER_TIMING = _env('SERVER_TIMING', False, _flag)
+
+# --- UPSTREAM SERVICES ---
+NEWSAPI_BASE_URL = _env('NEWSAPI_BASE_URL', 'https://newsapi.org')
+OPENROUTER_URL = _env('OPENROUTER_URL', 'https://openrouter.ai/api/v1/chat/completions')
+OPENROUTER_MODEL = _env('OPENROUTER_MODEL', 'google/gemini-2.0-flash-exp:free')
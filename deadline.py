@@ -0,0 +1,63 @@
+import time
+
+import config
+
+# =============================================================================
+# REQUEST DEADLINES
+# =============================================================================
+# Each summarize/quiz/chat request gets one time budget that is handed down
+# through the pipeline (fetch slot, download, parse, LLM call). Every stage
+# gets only the time that is left, minus a small reserve so a local fallback
+# can still be returned before the client's deadline.
+#
+# Budgets are best effort. requests applies its timeout to each socket read,
+# not to the whole download: a page that keeps trickling in is only cut off
+# once the chunk being read completes, so requests overshoot their budget. A
+# parse already running in the pool cannot be interrupted either.
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, cap=None, reserve=0.0, minimum=None):
+        """Seconds the next stage may use: time left minus ``reserve``, at most ``cap``.
+
+        Raises DeadlineExceeded when no time is left for the stage, unless a
+        ``minimum`` is given: the stage then gets at least that long.
+        """
+        left = self.remaining() - reserve
+        if minimum is not None:
+            left = max(left, minimum)
+        if left <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.budget:.1f}s exceeded")
+        return left if cap is None else min(cap, left)
+
+
+def request_deadline(default, data=None):
+    """Deadline for the current request.
+
+    Clients may set their own budget in seconds with a ``deadline`` field (JSON
+    body or query string) or an ``X-Request-Deadline`` header; it is capped at
+    MAX_REQUEST_DEADLINE.
+    """
+    from flask import request
+
+    requested = (data or {}).get('deadline') or request.headers.get('X-Request-Deadline')
+    try:
+        seconds = float(requested) if requested else default
+    except (TypeError, ValueError):
+        seconds = default
+    return Deadline(min(max(seconds, 0.1), config.MAX_REQUEST_DEADLINE))
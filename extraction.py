@@ -0,0 +1,308 @@
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from bs4 import BeautifulSoup
+
+import config
+from profiling import profiling_current_thread
+
+# =============================================================================
+# HTML PARSING (runs inside the extraction process pool)
+# =============================================================================
+# These functions take raw HTML and return plain data so they can be shipped
+# to worker processes; request threads only do the network I/O.
+
+def article_body_from_json_ld(data):
+    """The ``articleBody`` in parsed JSON-LD: an object, a list of them, or an ``@graph``."""
+    if isinstance(data, list):
+        for item in data:
+            body = article_body_from_json_ld(item)
+            if body:
+                return body
+    elif isinstance(data, dict):
+        body = data.get('articleBody')
+        if isinstance(body, str) and body.strip():
+            return body
+        return article_body_from_json_ld(data.get('@graph'))
+    return None
+
+
+def json_ld_body(soup):
+    """The first ``articleBody`` found in the page's JSON-LD blocks, if any."""
+    for json_ld in soup.find_all('script', type='application/ld+json'):
+        try:
+            body = article_body_from_json_ld(json.loads(json_ld.string or ''))
+        except ValueError:
+            continue
+        if body:
+            return body
+    return None
+
+
+def parse_article_html(html):
+    """Enhanced article extraction with multiple fallback strategies.
+
+    Returns ``{'text', 'method', 'word_count'}`` or None when too little text is found.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    article_text = None
+    extraction_method = "unknown"
+
+    # Strategy 1: Look for JSON-LD structured data (most reliable)
+    # Runs before cleanup, which removes every <script> tag
+    article_text = json_ld_body(soup)
+    if article_text:
+        extraction_method = "json_ld"
+        print("✅ Extracted via JSON-LD")
+
+    # Remove unwanted elements more aggressively
+    for element in soup(["script", "style", "nav", "header", "footer", "aside", 
+                       "iframe", "noscript", "button", "form", "input", "select"]):
+        element.decompose()
+
+    # Remove elements with common non-content classes
+    non_content_selectors = [
+        '.ad', '.ads', '.advertisement', '.social', '.share', '.comments',
+        '.newsletter', '.popup', '.modal', '.menu', '.sidebar', '.breadcrumb',
+        '.pagination', '.related', '.recommended', '.trending'
+    ]
+    for selector in non_content_selectors:
+        for element in soup.select(selector):
+            element.decompose()
+
+    # Strategy 2: Article tag with content scoring
+    if not article_text:
+        articles = soup.find_all('article')
+        for article in articles:
+            text = article.get_text(separator=' ', strip=True)
+            word_count = len(text.split())
+            if word_count > 100:
+                article_text = text
+                extraction_method = "article_tag"
+                print("✅ Extracted via article tag")
+                break
+
+    # Strategy 3: Common content containers with scoring
+    if not article_text:
+        content_selectors = [
+            'main', '[role="main"]', '.content', '.post-content', 
+            '.article-content', '.entry-content', '.story-content',
+            '.post-body', '.article-body', '.story-body', '.content-body',
+            '[itemprop="articleBody"]', '.article__body', '.article-text'
+        ]
+
+        best_text = ""
+        best_score = 0
+
+        for selector in content_selectors:
+            elements = soup.select(selector)
+            for element in elements:
+                text = element.get_text(separator=' ', strip=True)
+                words = text.split()
+                word_count = len(words)
+
+                # Score based on word count and paragraph structure
+                paragraphs = len(element.find_all('p', recursive=False))
+                score = word_count + (paragraphs * 10)
+
+                if score > best_score and word_count > 50:
+                    best_score = score
+                    best_text = text
+
+        if best_text:
+            article_text = best_text
+            extraction_method = f"content_container (score: {best_score})"
+            print(f"✅ Extracted via content container")
+
+    # Strategy 4: Smart paragraph collection (fallback)
+    if not article_text:
+        all_paragraphs = soup.find_all('p')
+        if len(all_paragraphs) > 3:
+            # Filter paragraphs by length and content quality
+            good_paragraphs = []
+            for p in all_paragraphs:
+                text = p.get_text(strip=True)
+                words = text.split()
+                if len(words) > 15 and len(words) < 200:
+                    if not any(word in text.lower() for word in ['login', 'sign up', 'subscribe', 'read more', 'click here']):
+                        good_paragraphs.append(text)
+
+            if len(good_paragraphs) >= 3:
+                article_text = ' '.join(good_paragraphs)
+                extraction_method = "smart_paragraphs"
+                print(f"✅ Extracted via {len(good_paragraphs)} smart paragraphs")
+
+    # Strategy 5: Meta description as last resort
+    if not article_text:
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and meta_desc.get('content'):
+            article_text = meta_desc.get('content')
+            extraction_method = "meta_description"
+            print("✅ Extracted via meta description")
+
+    # Clean and normalize the extracted text
+    if article_text:
+        # Remove extra whitespace
+        article_text = re.sub(r'\s+', ' ', article_text).strip()
+
+        # Remove very short lines that are likely noise
+        lines = article_text.split('. ')
+        cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 20]
+        article_text = '. '.join(cleaned_lines)
+
+        # Limit length for API constraints
+        words = article_text.split()
+        if len(words) > 1500:
+            article_text = ' '.join(words[:1500])
+            print(f"📝 Trimmed to 1500 words")
+
+        word_count = len(words)
+        print(f"📊 Extraction: {extraction_method}, Words: {word_count}")
+
+        if word_count >= 30:
+            return {'text': article_text, 'method': extraction_method, 'word_count': word_count}
+
+    print("❌ No sufficient text extracted")
+    return None
+
+
+
+def parse_quiz_html(html):
+    """Extract article content for quiz generation.
+
+    Returns ``{'text', 'method', 'word_count'}`` or None.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Read before cleanup removes the <script> tags; the streaming fetcher may
+    # stop right after this block, leaving no <article> to fall back on
+    structured_text = json_ld_body(soup)
+
+    # Remove unwanted elements
+    for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
+        element.decompose()
+
+    # Try multiple extraction strategies
+    article_text = None
+    extraction_method = "unknown"
+
+    # Strategy 1: Article tag (skipping short teasers when a full article follows)
+    articles = soup.find_all('article')
+    if articles:
+        texts = [article.get_text(separator=' ', strip=True) for article in articles]
+        article_text = next((text for text in texts if len(text.split()) > 100), texts[0])
+        extraction_method = "article_tag"
+
+    # Strategy 2: Common content containers
+    if not article_text:
+        content_selectors = ['main', '.content', '.article-content', '.post-content']
+        for selector in content_selectors:
+            element = soup.select_one(selector)
+            if element:
+                text = element.get_text(separator=' ', strip=True)
+                if len(text.split()) > 100:
+                    article_text = text
+                    extraction_method = "content_container"
+                    break
+
+    # Strategy 3: Paragraphs
+    if not article_text:
+        paragraphs = soup.find_all('p')
+        if len(paragraphs) > 3:
+            article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+            extraction_method = "paragraphs"
+
+    # Strategy 4: JSON-LD article body
+    if not article_text and structured_text:
+        article_text = structured_text
+        extraction_method = "json_ld"
+
+    if article_text:
+        # Clean and limit text
+        article_text = re.sub(r'\s+', ' ', article_text).strip()
+        words = article_text.split()
+        if len(words) > 1000:
+            article_text = ' '.join(words[:1000])
+
+        return {'text': article_text, 'method': extraction_method, 'word_count': len(article_text.split())}
+
+    return None
+
+
+# =============================================================================
+# EXTRACTION PROCESS POOL
+# =============================================================================
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _mp_context():
+    """Start method for pool processes.
+
+    The pool is created lazily inside a worker that already runs other threads
+    (request threads, headline refresh, the sampler). Forking then could copy a
+    lock held by one of them and deadlock the child, so pool processes come
+    from a forkserver (with this module preloaded), or spawn where it is missing.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _get_pool():
+    """Create the pool lazily, and again after a fork (pools do not survive fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=config.EXTRACTION_WORKERS, mp_context=_mp_context())
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def run_parser(parser, html, timeout=None):
+    """Run ``parser(html)`` in the extraction pool, or inline when the pool is disabled.
+
+    Requests being profiled also parse inline, so the parsing shows up in their profile.
+    """
+    if config.EXTRACTION_WORKERS <= 0 or profiling_current_thread():
+        return parser(html)
+
+    if timeout is None:
+        timeout = config.EXTRACTION_TIMEOUT
+
+    try:
+        future = _get_pool().submit(parser, html)
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # Drop the job if it has not started; a running parse cannot be interrupted
+        future.cancel()
+        raise
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page); start a fresh pool next time
+        print("⚠️ Extraction pool broken, parsing inline")
+        _reset_pool()
+        return parser(html)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
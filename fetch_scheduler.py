@@ -0,0 +1,173 @@
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import config
+
+# =============================================================================
+# PER-HOST FETCH SCHEDULER
+# =============================================================================
+# Publisher fetches are admitted through per-host slots so a batch of
+# headlines from one outlet does not hit it 20 times at once:
+#   - at most HOST_MAX_CONCURRENCY requests in flight per host
+#   - at least HOST_MIN_INTERVAL seconds between request starts per host
+#   (both server-wide: every worker process enforces its share)
+#   - exponential backoff for a host after 429/503 (Retry-After is honoured)
+#   - FETCH_MAX_CONCURRENCY slots overall, handed out round-robin across
+#     hosts so one busy outlet cannot starve the others
+
+
+class _Host:
+    def __init__(self):
+        self.active = 0
+        self.next_start = 0.0
+        self.failures = 0
+        self.waiting = deque()
+
+
+class HostScheduler:
+    def __init__(self, max_per_host=2, min_interval=0.25, max_total=16, backoff_base=2.0, backoff_max=120.0):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self.max_total = max_total
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._hosts = {}
+        self._ring = OrderedDict()   # Hosts with waiters, in round-robin order
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def _host(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = _Host()
+        return self._hosts[host]
+
+    def _dispatch(self, now):
+        """Grant slots to waiting tickets, one host at a time in round-robin order.
+
+        Returns the number of seconds until the next host becomes eligible.
+        """
+        next_wakeup = None
+        for name in list(self._ring):
+            if self._active >= self.max_total:
+                break
+            host = self._hosts[name]
+            if host.active >= self.max_per_host:
+                continue
+            if host.next_start > now:
+                wait = host.next_start - now
+                next_wakeup = wait if next_wakeup is None else min(next_wakeup, wait)
+                continue
+
+            ticket = host.waiting.popleft()
+            ticket['granted'] = True
+            host.active += 1
+            host.next_start = now + self.min_interval
+            self._active += 1
+
+            # Served hosts go to the back of the ring
+            del self._ring[name]
+            if host.waiting:
+                self._ring[name] = True
+        return next_wakeup
+
+    def acquire(self, host, timeout=None):
+        """Block until ``host`` may be fetched; raises TimeoutError after ``timeout`` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ticket = {'granted': False}
+
+        with self._cond:
+            state = self._host(host)
+            state.waiting.append(ticket)
+            self._ring.setdefault(host, True)
+
+            while True:
+                next_wakeup = self._dispatch(time.monotonic())
+                if ticket['granted']:
+                    self._cond.notify_all()
+                    return
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    state.waiting.remove(ticket)
+                    if not state.waiting:
+                        self._ring.pop(host, None)
+                    raise TimeoutError(f"Timed out waiting for a fetch slot for {host}")
+
+                waits = [w for w in (next_wakeup, remaining) if w is not None]
+                self._cond.wait(min(waits) if waits else None)
+
+    def release(self, host):
+        with self._cond:
+            self._hosts[host].active -= 1
+            self._active -= 1
+            self._dispatch(time.monotonic())
+            self._cond.notify_all()
+
+    def report(self, host, status_code, retry_after=None):
+        """Record a response status; 429/503 push the host's next start time back."""
+        with self._cond:
+            state = self._host(host)
+            if status_code in (429, 503):
+                state.failures += 1
+                delay = min(self.backoff_max, self.backoff_base ** state.failures)
+                if retry_after and str(retry_after).isdigit():
+                    delay = min(self.backoff_max, max(delay, int(retry_after)))
+                state.next_start = max(state.next_start, time.monotonic() + delay)
+                print(f"🐢 {host} returned {status_code}, backing off {delay:.0f}s")
+            elif status_code < 400:
+                state.failures = 0
+
+    @contextmanager
+    def slot(self, url, timeout=None):
+        host = urlsplit(url).hostname or ''
+        self.acquire(host, timeout)
+        try:
+            yield host
+        finally:
+            self.release(host)
+
+
+# Scheduler state is per process, so each worker gets its share of the host limits
+_workers = max(1, config.WORKERS)
+scheduler = HostScheduler(
+    max_per_host=max(1, config.HOST_MAX_CONCURRENCY // _workers),
+    min_interval=config.HOST_MIN_INTERVAL * _workers,
+    max_total=config.FETCH_MAX_CONCURRENCY,
+    backoff_max=config.HOST_BACKOFF_MAX,
+)
+
+# =============================================================================
+# DNS CACHE
+# =============================================================================
+
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache = {}
+_dns_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """socket.getaddrinfo with successful lookups cached for DNS_CACHE_TTL seconds."""
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (now + config.DNS_CACHE_TTL, result)
+        if len(_dns_cache) > 1024:
+            for stale in [k for k, (expires, _) in _dns_cache.items() if expires <= now]:
+                del _dns_cache[stale]
+    return result
+
+
+def install_dns_cache():
+    """Route every lookup in this process (requests/urllib3 included) through the cache."""
+    if config.DNS_CACHE_TTL > 0 and socket.getaddrinfo is _original_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
@@ -0,0 +1,255 @@
+import codecs
+import json
+import re
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from fetch_scheduler import install_dns_cache, scheduler
+
+# =============================================================================
+# STREAMING PAGE FETCHER
+# =============================================================================
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024   # Stop downloading after 2 MB of HTML
+CHUNK_SIZE = 16 * 1024
+ALLOWED_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Markers after which the article body may have fully arrived
+ARTICLE_END_RE = re.compile(r'</article\s*>', re.IGNORECASE)
+JSON_LD_BODY_RE = re.compile(r'"articleBody"\s*:')
+SCRIPT_END_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+MARKER_OVERLAP = 64
+MIN_BODY_WORDS = 100
+MAX_BODY_CHECKS = 32   # Listing pages close hundreds of teaser <article>s; stop checking after this many
+
+# Used to check the buffered HTML once a marker has arrived
+ARTICLE_RE = re.compile(r'<article\b[^>]*>(.*?)</article\s*>', re.IGNORECASE | re.DOTALL)
+JSON_LD_RE = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+BOILERPLATE_RE = re.compile(r'<(script|style|nav|header|footer|aside|noscript|form)\b.*?</\1\s*>',
+                            re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+install_dns_cache()
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be fetched or is not usable HTML."""
+
+
+class PinnedAdapter(HTTPAdapter):
+    """Connects to one address that was already checked, instead of resolving the host again.
+
+    The Host header, TLS SNI and the certificate check still use the URL's
+    hostname, so virtual hosts and HTTPS work as usual; only the second DNS
+    lookup (which a rebinding attacker could answer differently) is skipped.
+    """
+
+    def __init__(self, address, **kwargs):
+        self.address = address
+        super().__init__(**kwargs)
+
+    def _pinned_pool(self, url, pool_kwargs):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        if parts.scheme == 'https':
+            pool_kwargs = dict(pool_kwargs, server_hostname=parts.hostname, assert_hostname=parts.hostname)
+        return self.poolmanager.connection_from_host(self.address, port, parts.scheme, pool_kwargs=pool_kwargs)
+
+    def get_connection(self, url, proxies=None):
+        # requests < 2.32 (verification settings are applied to the pool afterwards)
+        return self._pinned_pool(url, {})
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        _, pool_kwargs = self.build_connection_pool_key_attributes(request, verify, cert)
+        return self._pinned_pool(request.url, pool_kwargs)
+
+    def send(self, request, *args, **kwargs):
+        parts = urlsplit(request.url)
+        host = f"[{parts.hostname}]" if ':' in parts.hostname else parts.hostname
+        request.headers['Host'] = f"{host}:{parts.port}" if parts.port else host
+        return super().send(request, *args, **kwargs)
+
+
+def pinned_session(address=None):
+    """A session whose connections all go to ``address`` (a plain session when None)."""
+    session = requests.Session()
+    if address:
+        # A proxy would resolve the hostname itself
+        session.trust_env = False
+        adapter = PinnedAdapter(address)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
+def _marker_seen(window, state):
+    """Scan newly decoded HTML for a marker after which the body may be complete.
+
+    ``window`` holds the new text plus a short overlap from the previous chunk so
+    markers split across chunks are still found; ``state`` remembers whether a
+    JSON-LD ``articleBody`` has started.
+    """
+    seen = ARTICLE_END_RE.search(window) is not None
+    if not state.get('json_ld_body'):
+        match = JSON_LD_BODY_RE.search(window)
+        if match:
+            state['json_ld_body'] = True
+            window = window[match.end():]
+    if state.get('json_ld_body') and SCRIPT_END_RE.search(window):
+        # Checked once; the next articleBody re-arms the JSON-LD marker
+        state['json_ld_body'] = False
+        seen = True
+    return seen
+
+
+def _body_extractable(pending):
+    """Check the blocks closed in ``pending`` for a body the extractors will use.
+
+    That is a JSON-LD ``articleBody`` (in any block, including ``@graph``
+    entries) or an ``<article>`` of more than MIN_BODY_WORDS words; a teaser
+    article or a truncated JSON-LD block does not count. ``pending`` is the
+    HTML received since the previous check, so each byte is scanned about
+    once. Returns ``(found, checked)``: text before ``checked`` holds only
+    closed blocks and need not be scanned again.
+    """
+    from extraction import article_body_from_json_ld
+
+    checked = 0
+    for match in JSON_LD_RE.finditer(pending):
+        checked = max(checked, match.end())
+        try:
+            body = article_body_from_json_ld(json.loads(match.group(1)))
+        except ValueError:
+            continue
+        if body and len(body.split()) >= MIN_BODY_WORDS:
+            return True, checked
+    for match in ARTICLE_RE.finditer(pending):
+        checked = max(checked, match.end())
+        text = TAG_RE.sub(' ', BOILERPLATE_RE.sub(' ', match.group(1)))
+        if len(text.split()) > MIN_BODY_WORDS:
+            return True, checked
+    return False, checked
+
+
+def _pick_encoding(response, first_chunk):
+    """Choose a decoder from the HTTP header, the page's meta tag, or UTF-8."""
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    else:
+        match = CHARSET_RE.search(first_chunk[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return encoding
+
+
+def fetch_html(url, headers=None, timeout=15, max_bytes=MAX_PAGE_BYTES, stop_early=True, deadline=None):
+    """Stream a page, rejecting non-HTML early and capping the download size.
+
+    Returns the decoded HTML. When ``stop_early`` is set the download ends as soon
+    as the HTML so far holds an article body the extractors can use: a complete
+    ``<article>`` of real length or a JSON-LD block with ``articleBody``.
+    With a ``deadline`` every wait is bounded by the time left, and a download
+    still running when it expires is cut off and whatever arrived is returned.
+    """
+    queue_timeout = config.FETCH_QUEUE_TIMEOUT
+    if deadline is not None:
+        queue_timeout = deadline.timeout(cap=queue_timeout)
+
+    # Wait for a per-host slot so one outlet never sees a burst of parallel fetches
+    try:
+        with scheduler.slot(url, timeout=queue_timeout) as host:
+            if deadline is not None:
+                timeout = deadline.timeout(cap=timeout)
+            response = requests.get(url, headers=headers or DEFAULT_HEADERS, timeout=timeout, stream=True)
+            scheduler.report(host, response.status_code, response.headers.get('Retry-After'))
+            return _read_html(response, max_bytes, stop_early, deadline)
+    except TimeoutError as e:
+        raise FetchError(str(e))
+
+
+def _read_html(response, max_bytes, stop_early, deadline=None):
+    """Download and decode the body of an HTML response."""
+    try:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+            raise FetchError(f"Unsupported content type: {content_type}")
+
+        declared_length = response.headers.get('Content-Length')
+        if declared_length and declared_length.isdigit() and int(declared_length) > max_bytes * 4:
+            # Compressed size already far beyond what we would keep
+            raise FetchError(f"Page too large: {declared_length} bytes")
+
+        decoder = None
+        parts = []
+        received = 0
+        carry = ''
+        state = {}
+        pending = ''   # Text received since the last body check
+        checks = 0
+
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if not chunk:
+                    continue
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(_pick_encoding(response, chunk))(errors='replace')
+
+                chunk = chunk[:max_bytes - received]
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                parts.append(text)
+
+                if received >= max_bytes:
+                    print(f"📏 Page capped at {max_bytes} bytes")
+                    break
+
+                if deadline is not None and deadline.expired:
+                    print(f"⏱️ Deadline reached after {received} bytes, using partial page")
+                    break
+
+                if stop_early:
+                    window = carry + text
+                    pending += text
+                    if _marker_seen(window, state):
+                        # A teaser <article> or an unusable JSON-LD block does not end the download
+                        found, checked = _body_extractable(pending)
+                        if found:
+                            print(f"⚡ Article body complete after {received} bytes, stopping download")
+                            break
+                        pending = pending[checked:]
+                        checks += 1
+                        if checks >= MAX_BODY_CHECKS:
+                            stop_early = False
+                    carry = window[-MARKER_OVERLAP:]
+        except requests.RequestException:
+            # A read that timed out at the deadline still leaves a usable partial page
+            if not (parts and deadline is not None and deadline.expired):
+                raise
+            print(f"⏱️ Deadline reached after {received} bytes, using partial page")
+
+        if decoder is not None:
+            parts.append(decoder.decode(b'', final=True))
+
+        return ''.join(parts)
+
+    finally:
+        response.close()
@@ -0,0 +1,114 @@
+import base64
+import binascii
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
+# =============================================================================
+# HEADLINE SET & PAGINATION
+# =============================================================================
+# Each (country, category) topic keeps one merged headline set: every refresh
+# is folded into it, duplicates are dropped and the result is sorted newest
+# first. Pages are cut from that set with keyset cursors (the publishedAt and
+# URL of the last article sent), so articles added by a background refresh
+# never shift or repeat the pages a client is scrolling through.
+
+FIELDS = ('title', 'source', 'description', 'url', 'image', 'published', 'published_at')
+
+
+class CursorError(ValueError):
+    pass
+
+
+def normalize_published_at(value):
+    """ISO timestamp as "YYYY-MM-DDTHH:MM:SSZ" (sortable as text), or "" when unparseable."""
+    try:
+        parsed = datetime.fromisoformat((value or '').replace('Z', '+00:00'))
+    except ValueError:
+        return ''
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _title_key(title):
+    # Syndicated copies differ only in the " - Source" suffix
+    title = re.sub(r'\s+[-|–]\s+[^-|–]+$', '', title or '')
+    return re.sub(r'\W+', ' ', title).strip().lower()
+
+
+def sort_key(article):
+    """Newest first; the URL breaks ties so the order is total."""
+    return (_invert(article.get('published_at') or ''), article['url'])
+
+
+def _invert(text):
+    # Sort descending on a string inside an ascending tuple sort
+    return tuple(-ord(c) for c in text) + (1,)
+
+
+def merge_headlines(existing, fresh, max_items=200, max_age_hours=48):
+    """Fold a fresh fetch into the topic's set: dedupe, drop old articles, newest first."""
+    by_url = {a['url']: a for a in existing if a.get('url')}
+    for article in fresh:
+        if article.get('url') and article.get('title') != '[Removed]':
+            # Newer copies win (titles and descriptions get edited)
+            by_url[article['url']] = article
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    merged, seen_titles = [], set()
+    for article in sorted(by_url.values(), key=sort_key):
+        if article.get('published_at') and article['published_at'] < cutoff:
+            continue
+        title_key = _title_key(article.get('title'))
+        if title_key and title_key in seen_titles:
+            continue
+        seen_titles.add(title_key)
+        merged.append(article)
+    return merged[:max_items]
+
+
+def encode_cursor(article):
+    raw = json.dumps([article.get('published_at') or '', article['url']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published_at, url = json.loads(raw)
+        return {'published_at': str(published_at), 'url': str(url)}
+    except (ValueError, TypeError, binascii.Error):
+        raise CursorError('Invalid cursor')
+
+
+def parse_fields(value):
+    """Requested fields from a comma-separated string or a JSON list; the URL is always included."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(f, str) for f in value):
+        raise ValueError(f"fields must be a comma-separated string or a list of: {', '.join(FIELDS)}")
+    fields = [f.strip() for f in value if f.strip()]
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Use: {', '.join(FIELDS)}")
+    return set(fields) | {'url'}
+
+
+def paginate(articles, cursor=None, limit=20, fields=None):
+    """One page of a sorted headline set.
+
+    Returns ``(page, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    start = 0
+    if cursor:
+        after = sort_key(decode_cursor(cursor))
+        start = next((i for i, a in enumerate(articles) if sort_key(a) > after), len(articles))
+
+    page = articles[start:start + limit]
+    next_cursor = encode_cursor(page[-1]) if page and start + limit < len(articles) else None
+    if fields:
+        page = [{k: v for k, v in a.items() if k in fields} for a in page]
+    return page, next_cursor
@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from flask import Response, request, jsonify
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is used when brotli is not installed
+    brotli = None
+
+# =============================================================================
+# HTTP CACHING & COMPRESSION
+# =============================================================================
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript', 'image/svg+xml',
+}
+MIN_COMPRESS_SIZE = 500          # Bytes; smaller bodies are not worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+STATIC_MAX_AGE = 365 * 24 * 3600  # Fingerprinted static files never change
+
+# Compressed static files, keyed by (etag, encoding)
+_static_cache = OrderedDict()
+_static_cache_lock = threading.Lock()
+STATIC_CACHE_SIZE = 64
+
+# Fingerprints of static files, keyed by path -> (mtime, hash)
+_fingerprints = {}
+
+
+def body_etag(data):
+    """Strong ETag for a response body."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _etag_matches(etag):
+    """Check If-None-Match, accepting the encoding-suffixed variants we hand out."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    return any(if_none_match.contains(candidate)
+               for candidate in (etag, f"{etag}-gzip", f"{etag}-br"))
+
+
+def _encoding_for(data, mimetype):
+    """Content-Encoding a 200 with this body would be sent with, or None."""
+    if mimetype not in COMPRESSIBLE_TYPES or len(data) < MIN_COMPRESS_SIZE:
+        return None
+    return _choose_encoding()
+
+
+def _not_modified(response, etag, data, mimetype):
+    """Turn ``response`` into a 304 carrying the validator and Vary of the matching 200."""
+    encoding = _encoding_for(data, mimetype)
+    response.status_code = 304
+    response.set_data(b'')
+    response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+    if mimetype in COMPRESSIBLE_TYPES:
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def conditional_json(payload, max_age, public=True):
+    """jsonify ``payload`` with a strong ETag, Cache-Control, and a 304 when the client is current.
+
+    Works for POST as well as GET, so the frontend can revalidate with If-None-Match.
+    """
+    response = jsonify(payload)
+    data = response.get_data()
+    etag = body_etag(data)
+    if _etag_matches(etag):
+        response = _not_modified(Response(), etag, data, response.mimetype)
+    else:
+        # cache_and_compress adds the encoding suffix if it compresses the body
+        response.set_etag(etag)
+    response.cache_control.public = public
+    response.cache_control.private = not public
+    response.cache_control.max_age = max_age
+    return response
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def _compress_cached(data, etag, encoding):
+    """Compress static files once per version instead of on every request."""
+    key = (etag, encoding)
+    with _static_cache_lock:
+        if key in _static_cache:
+            _static_cache.move_to_end(key)
+            return _static_cache[key]
+
+    compressed = _compress(data, encoding)
+
+    with _static_cache_lock:
+        _static_cache[key] = compressed
+        while len(_static_cache) > STATIC_CACHE_SIZE:
+            _static_cache.popitem(last=False)
+    return compressed
+
+
+def static_fingerprint(app, filename):
+    """Short content hash for a static file, recomputed only when it changes."""
+    path = os.path.join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    _fingerprints[path] = (mtime, digest)
+    return digest
+
+
+def init_app(app):
+    """Register fingerprinted static URLs, conditional GETs and response compression."""
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            fingerprint = static_fingerprint(app, values['filename'])
+            if fingerprint:
+                values['v'] = fingerprint
+
+    @app.after_request
+    def cache_and_compress(response):
+        is_static = request.endpoint == 'static'
+        if is_static:
+            if request.args.get('v'):
+                response.cache_control.public = True
+                response.cache_control.max_age = STATIC_MAX_AGE
+                response.cache_control.immutable = True
+                response.cache_control.no_cache = None
+            # Buffer the file so it can be compressed (Flask streams it by default)
+            response.direct_passthrough = False
+            response.make_sequence()
+        elif response.is_streamed:
+            return response
+
+        # Strong ETag + 304 for GET responses that did not set their own
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            etag, _ = response.get_etag()
+            if not etag:
+                etag = body_etag(response.get_data())
+                response.set_etag(etag)
+            if _etag_matches(etag):
+                return _not_modified(response, etag, response.get_data(), response.mimetype)
+
+        if (response.status_code != 200
+                or response.mimetype not in COMPRESSIBLE_TYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        encoding = _choose_encoding()
+        if not encoding or len(data) < MIN_COMPRESS_SIZE:
+            return response
+
+        etag, _ = response.get_etag()
+        if is_static and etag:
+            compressed = _compress_cached(data, etag, encoding)
+        else:
+            compressed = _compress(data, encoding)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f"{etag}-{encoding}")
+        return response
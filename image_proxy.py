@@ -0,0 +1,296 @@
+import functools
+import hashlib
+import hmac
+import io
+import ipaddress
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional: without Pillow, cards load images from the publisher
+    Image = None
+
+# =============================================================================
+# IMAGE PROXY
+# =============================================================================
+# Headline images are often 1-3 MB originals. /img fetches them once, crops
+# and scales them to card size, re-encodes them as WebP (JPEG for browsers
+# without WebP) and keeps the result on disk, evicting the least recently
+# used thumbnails once the cache directory outgrows IMAGE_CACHE_MAX_BYTES.
+
+CHUNK_SIZE = 64 * 1024
+FAILURE_TTL = 120   # Seconds to answer 404 straight away for an image that failed
+MAX_REDIRECTS = 3
+SECRET_FILE = '.proxy-secret'
+FORMATS = {'webp': ('WEBP', 'image/webp'), 'jpeg': ('JPEG', 'image/jpeg')}
+
+
+_secret = None
+_secret_lock = threading.Lock()
+
+
+def _load_secret():
+    """IMAGE_PROXY_SECRET, or a random one kept in IMAGE_CACHE_DIR so all workers share it.
+
+    Returns "" when no secret can be stored, which turns the proxy off.
+    """
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            _secret = config.IMAGE_PROXY_SECRET
+            if not _secret:
+                try:
+                    _secret = _shared_secret(os.path.join(config.IMAGE_CACHE_DIR, SECRET_FILE))
+                except OSError as e:
+                    print(f"⚠️ Image proxy disabled, cannot store its secret: {e}")
+                    _secret = ''
+        return _secret
+
+
+def _shared_secret(path):
+    try:
+        with open(path, encoding='ascii') as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='ascii') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            # Fails when another worker created the file first; then use theirs
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.remove(tmp_path)
+    with open(path, encoding='ascii') as f:
+        return f.read().strip()
+
+
+def enabled():
+    return Image is not None and config.IMAGE_PROXY and bool(_load_secret())
+
+
+def sign(url):
+    return hmac.new(_load_secret().encode(), url.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+
+def verify(url, signature):
+    return bool(url and signature and _load_secret()) and hmac.compare_digest(sign(url), signature)
+
+
+def proxy_url(url):
+    """The /img URL serving a thumbnail of ``url`` (unchanged when the proxy is off)."""
+    if not url or not enabled():
+        return url
+    return '/img?' + urlencode({'u': url, 's': sign(url)})
+
+
+def make_thumbnail(data, size, fmt):
+    """Crop and scale image bytes to ``size`` and encode them as ``fmt`` (runs in the extraction pool)."""
+    image = Image.open(io.BytesIO(data))
+    # JPEGs can be decoded straight at a fraction of their size, which is much faster
+    image.draft('RGB', (size[0] * 2, size[1] * 2))
+    image = ImageOps.exif_transpose(image)
+
+    pil_format = FORMATS[fmt][0]
+    if image.mode not in ('RGB', 'RGBA') or (pil_format == 'JPEG' and image.mode == 'RGBA'):
+        image = image.convert('RGB')
+
+    image = ImageOps.fit(image, size, Image.LANCZOS)
+    output = io.BytesIO()
+    if pil_format == 'JPEG':
+        image.save(output, 'JPEG', quality=config.IMAGE_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(output, 'WEBP', quality=config.IMAGE_QUALITY, method=4)
+    return output.getvalue()
+
+
+class ThumbnailCache:
+    """Thumbnails on disk; file modification times record the last use for LRU eviction."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._written = None   # Bytes written since the last size check (None: not checked yet)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so other workers never read a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            due = self._written is None or self._written + len(data) > self.max_bytes // 20
+            self._written = 0 if due else self._written + len(data)
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used thumbnails until the cache is under 90% of its budget."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    # Dot files are temporary writes and the proxy secret
+                    if entry.is_file() and not entry.name.startswith('.'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        print(f"🧹 Image cache: evicted {removed} thumbnails")
+
+
+thumbnail_cache = ThumbnailCache(config.IMAGE_CACHE_DIR, config.IMAGE_CACHE_MAX_BYTES)
+
+_failures = {}
+_failures_lock = threading.Lock()
+
+
+def cache_key(url, fmt):
+    raw = f"{url}|{config.IMAGE_WIDTH}x{config.IMAGE_HEIGHT}|q{config.IMAGE_QUALITY}|{fmt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:40] + '.' + fmt
+
+
+def check_public_url(url):
+    """Raise ValueError unless ``url`` is http(s) on a host with only public addresses.
+
+    Keeps the proxy from reaching loopback, private and link-local services
+    (cloud metadata endpoints included), unless IMAGE_ALLOW_PRIVATE is set.
+    Returns the checked address to connect to (None with IMAGE_ALLOW_PRIVATE).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"Not an http(s) URL: {url}")
+    if config.IMAGE_ALLOW_PRIVATE:
+        return None
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        infos = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot resolve {parts.hostname}: {e}")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split('%')[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"Refusing non-public address {address} for {parts.hostname}")
+    return infos[0][4][0]
+
+
+def _download(url):
+    from fetcher import DEFAULT_HEADERS, pinned_session
+
+    headers = dict(DEFAULT_HEADERS, Accept='image/avif,image/webp,image/*,*/*;q=0.8')
+    # Redirects are followed by hand so every hop is checked, and each hop
+    # connects to the address that passed the check rather than resolving again
+    for _ in range(MAX_REDIRECTS + 1):
+        session = pinned_session(check_public_url(url))
+        try:
+            response = session.get(url, headers=headers, timeout=config.IMAGE_FETCH_TIMEOUT,
+                                   stream=True, allow_redirects=False)
+        except Exception:
+            session.close()
+            raise
+        if not response.is_redirect:
+            break
+        url = urljoin(url, response.headers['Location'])
+        response.close()
+        session.close()
+    else:
+        raise ValueError(f"More than {MAX_REDIRECTS} redirects")
+
+    with session, response:
+        response.raise_for_status()
+        if not response.headers.get('Content-Type', '').startswith('image/'):
+            raise ValueError(f"Not an image: {response.headers.get('Content-Type')}")
+
+        parts, received = [], 0
+        started = time.monotonic()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            received += len(chunk)
+            if received > config.IMAGE_MAX_BYTES:
+                raise ValueError(f"Image larger than {config.IMAGE_MAX_BYTES} bytes")
+            if time.monotonic() - started > config.IMAGE_FETCH_TIMEOUT:
+                raise TimeoutError("Image download too slow")
+            parts.append(chunk)
+        return b''.join(parts)
+
+
+def get_thumbnail(url, fmt):
+    """Thumbnail bytes for ``url`` in ``fmt`` ("webp" or "jpeg"), or None when unavailable."""
+    key = cache_key(url, fmt)
+    data = thumbnail_cache.get(key)
+    if data is not None:
+        return data
+
+    with _failures_lock:
+        if _failures.get(url, 0) > time.time():
+            return None
+
+    from extraction import run_parser
+    from profiling import stage
+
+    try:
+        with stage('download'):
+            original = _download(url)
+        size = (config.IMAGE_WIDTH, config.IMAGE_HEIGHT)
+        with stage('resize'):
+            data = run_parser(functools.partial(make_thumbnail, size=size, fmt=fmt), original)
+    except Exception as e:
+        print(f"🖼️ Thumbnail failed for {url}: {e}")
+        with _failures_lock:
+            _failures[url] = time.time() + FAILURE_TTL
+            if len(_failures) > 1000:
+                now = time.time()
+                for stale in [u for u, until in _failures.items() if until < now]:
+                    del _failures[stale]
+        return None
+
+    print(f"🖼️ Thumbnail {len(original) // 1024} KB -> {len(data) // 1024} KB ({fmt})")
+    thumbnail_cache.put(key, data)
+    return data
@@ -0,0 +1,263 @@
+import random
+import re
+import threading
+from collections import deque
+
+# =============================================================================
+# LOCAL QUIZ GENERATOR
+# =============================================================================
+# Builds fill-in-the-blank multiple-choice questions straight from the article
+# text: names, numbers and dates become answers, and distractors are other
+# values of the same kind from the article (or recent articles). Pure regex
+# work, so it runs in milliseconds and never touches the LLM quota.
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+MONTH_PATTERN = r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?'
+DATE_RE = re.compile(
+    rf'\b(?:{MONTH_PATTERN}\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,\s*\d{{4}})?'
+    rf'|\d{{1,2}}\s+{MONTH_PATTERN}(?:\s+\d{{4}})?'
+    rf'|{MONTH_PATTERN}\s+\d{{4}})\b'
+)
+YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+NUMBER_RE = re.compile(
+    r'(?<![\w.])(?:[$£€]\s?)?\d{1,3}(?:,\d{3})+(?:\.\d+)?(?:\s?(?:%|percent|million|billion|trillion))?'
+    r'|(?<![\w.])(?:[$£€]\s?)?\d+(?:\.\d+)?(?:\s?(?:%|percent|million|billion|trillion))?'
+)
+ENTITY_RE = re.compile(r"\b[A-Z][a-zA-Z'\-]+(?:\s+(?:of|for|and|de|the)?\s*[A-Z][a-zA-Z'\-]+)*")
+
+# Capitalised words that are not useful answers on their own
+ENTITY_STOPWORDS = {
+    'The', 'A', 'An', 'This', 'That', 'These', 'Those', 'It', 'He', 'She', 'They', 'We', 'I',
+    'In', 'On', 'At', 'But', 'And', 'Or', 'If', 'As', 'For', 'With', 'After', 'Before',
+    'When', 'While', 'According', 'However', 'Meanwhile', 'Also', 'Mr', 'Mrs', 'Ms', 'Dr',
+    'His', 'Her', 'Their', 'Our', 'Its', 'There', 'Here', 'What', 'Why', 'How', 'Who',
+} | set(MONTHS) | set(WEEKDAYS)
+
+BLANK = '_____'
+MIN_SENTENCE_WORDS = 8
+MAX_SENTENCE_WORDS = 45
+OPTIONS_PER_QUESTION = 4
+
+# Recently seen answers by type, used when an article has too few of its own
+_corpus = {'entity': deque(maxlen=300), 'number': deque(maxlen=300), 'date': deque(maxlen=300), 'year': deque(maxlen=300)}
+_corpus_lock = threading.Lock()
+
+
+def split_sentences(text):
+    """Sentences of a usable length; lines (e.g. "- fact" bullets) never run together."""
+    sentences = []
+    for line in (text or '').splitlines():
+        line = re.sub(r'^\s*(?:[-*•]|Summary:|Key facts:)\s*', '', line)
+        line = re.sub(r'\s+', ' ', line).strip()
+        sentences.extend(re.split(r'(?<=[.!?])\s+(?=[A-Z"\'])', line))
+    return [s.strip() for s in sentences if MIN_SENTENCE_WORDS <= len(s.split()) <= MAX_SENTENCE_WORDS]
+
+
+def _clean_entity(entity):
+    words = entity.split()
+    while words and words[0] in ENTITY_STOPWORDS:
+        words = words[1:]
+    while words and words[-1].lower() in ('of', 'for', 'and', 'de', 'the'):
+        words = words[:-1]
+    return ' '.join(words)
+
+
+def find_candidates(sentence):
+    """Answer candidates in a sentence as (type, text, start, end) tuples, most specific first."""
+    candidates = []
+    taken = []
+
+    def add(kind, match_start, match_end, value):
+        if any(start < match_end and match_start < end for start, end in taken):
+            return
+        taken.append((match_start, match_end))
+        candidates.append((kind, value, match_start, match_end))
+
+    for match in DATE_RE.finditer(sentence):
+        add('date', match.start(), match.end(), match.group(0))
+    for match in YEAR_RE.finditer(sentence):
+        add('year', match.start(), match.end(), match.group(0))
+    for match in NUMBER_RE.finditer(sentence):
+        value = match.group(0).strip()
+        # Bare single digits make poor questions ("3 people")
+        if len(re.sub(r'\D', '', value)) > 1 or not value.isdigit():
+            start = match.start() + match.group(0).index(value)
+            add('number', start, start + len(value), value)
+    for match in ENTITY_RE.finditer(sentence):
+        entity = _clean_entity(match.group(0))
+        if not entity or len(entity) < 3:
+            continue
+        # A lone capitalised word at the start of a sentence is usually not a name
+        if match.start() == 0 and ' ' not in entity and entity == match.group(0):
+            continue
+        start = sentence.find(entity, match.start())
+        add('entity', start, start + len(entity), entity)
+    return candidates
+
+
+def _number_variants(value, rng):
+    """Plausible wrong numbers that keep the original's format (currency, %, scale words)."""
+    match = re.search(r'\d[\d,]*(?:\.\d+)?', value)
+    if not match:
+        return []
+    raw = match.group(0)
+    number = float(raw.replace(',', ''))
+    decimals = len(raw.split('.')[1]) if '.' in raw else 0
+    variants = set()
+    for factor in rng.sample([0.5, 0.75, 1.25, 1.5, 2, 3, 0.25, 10], 8):
+        changed = number * factor
+        if decimals:
+            text = f"{changed:,.{decimals}f}" if ',' in raw else f"{changed:.{decimals}f}"
+        else:
+            changed = round(changed)
+            text = f"{changed:,}" if ',' in raw else str(changed)
+        if changed and text != raw:
+            variants.add(value[:match.start()] + text + value[match.end():])
+    return list(variants)
+
+
+def _date_variants(value, kind, rng):
+    if kind == 'year':
+        year = int(value)
+        return [str(year + delta) for delta in rng.sample([-3, -2, -1, 1, 2, 3], 6)]
+    match = re.search(MONTH_PATTERN, value)
+    if not match:
+        return []
+    token = match.group(0)
+    name = token.rstrip('.')
+    month = next(m for m in MONTHS if m.startswith(name[:3]))
+    others = rng.sample([m for m in MONTHS if m != month], 5)
+    if name != month:
+        # Keep the abbreviated style: "Sept. 5" becomes "Mar. 5", not "March. 5"
+        others = [m[:3] + (token[len(name):] if len(m) > 3 else '') for m in others]
+    return [value[:match.start()] + other + value[match.end():] for other in others]
+
+
+def _shape(value, kind):
+    """Format signature so options look alike: "5.3 percent" never competes with "$20"."""
+    if kind == 'number':
+        return (value[:1] if value[:1] in '$£€' else '', re.sub(r'^[^a-z%]*', '', value.lower()))
+    if kind == 'date':
+        return re.sub(r'\d', '9', re.sub(MONTH_PATTERN, 'M', value))
+    return None
+
+
+def pick_distractors(answer, kind, pool, rng, sentence=''):
+    """Three wrong options of the same type: article first, then corpus, then generated.
+
+    Values that already appear in the question's sentence are skipped.
+    """
+    chosen = []
+    seen = {answer.lower()}
+    shape = _shape(answer, kind)
+
+    def take(options):
+        for option in options:
+            if len(chosen) == OPTIONS_PER_QUESTION - 1:
+                return
+            if _shape(option, kind) != shape or option in sentence:
+                continue
+            if option.lower() not in seen and option.lower() not in answer.lower() and answer.lower() not in option.lower():
+                seen.add(option.lower())
+                chosen.append(option)
+
+    take(rng.sample(pool, len(pool)))
+    with _corpus_lock:
+        corpus = list(_corpus[kind])
+    take(rng.sample(corpus, len(corpus)))
+    if kind == 'number':
+        take(_number_variants(answer, rng))
+    elif kind in ('date', 'year'):
+        take(_date_variants(answer, kind, rng))
+    return chosen if len(chosen) == OPTIONS_PER_QUESTION - 1 else None
+
+
+def _remember(candidates_by_kind):
+    with _corpus_lock:
+        for kind, values in candidates_by_kind.items():
+            for value in values:
+                if value not in _corpus[kind]:
+                    _corpus[kind].append(value)
+
+
+def extract_key_facts(content, limit=4):
+    """The sentences carrying the most names, numbers and dates, in article order."""
+    sentences = split_sentences(content)
+    kind_weight = {'number': 2, 'date': 2, 'year': 1.5, 'entity': 1}
+    scored = []
+    for index, sentence in enumerate(sentences):
+        score = sum(kind_weight[kind] for kind, *_ in find_candidates(sentence))
+        if score:
+            scored.append((score - index * 0.02, index, sentence))
+    top = sorted(scored, reverse=True)[:limit]
+    return [sentence for _, _, sentence in sorted(top, key=lambda item: item[1])]
+
+
+def generate_local_quiz(content, num_questions=3, seed=None):
+    """Build up to ``num_questions`` cloze multiple-choice questions from article text.
+
+    Returns ``{"questions": [...]}`` in the same format as the AI quiz, or None
+    when the text has too few usable facts.
+    """
+    rng = random.Random(seed)
+    sentences = split_sentences(content)
+    if not sentences:
+        return None
+
+    per_sentence = [(i, sentence, find_candidates(sentence)) for i, sentence in enumerate(sentences)]
+
+    # Same-type answers across the article are the distractor pool
+    by_kind = {kind: [] for kind in _corpus}
+    for _, _, candidates in per_sentence:
+        for kind, value, _, _ in candidates:
+            if value not in by_kind[kind]:
+                by_kind[kind].append(value)
+
+    # Prefer early sentences and facts that are not names (numbers and dates make crisp questions)
+    kind_weight = {'number': 3, 'date': 3, 'year': 2, 'entity': 1}
+    ranked = []
+    for index, sentence, candidates in per_sentence:
+        for kind, value, start, end in candidates:
+            score = kind_weight[kind] - index * 0.05 + rng.random() * 0.5
+            ranked.append((score, index, sentence, kind, value, start, end))
+    ranked.sort(reverse=True)
+
+    questions = []
+    used_sentences, used_answers, used_kinds = set(), set(), []
+    for _, index, sentence, kind, value, start, end in ranked:
+        if len(questions) == num_questions:
+            break
+        # A sentence repeated in the text (e.g. a pull quote) would give away another question's answer
+        sentence_key = re.sub(r'\W+', ' ', sentence).strip().lower()
+        if sentence_key in used_sentences or value.lower() in used_answers:
+            continue
+        # Mix question types while there are alternatives left
+        if used_kinds.count(kind) >= 2 and len(ranked) > num_questions * 2:
+            continue
+
+        pool = [v for v in by_kind[kind] if v != value]
+        distractors = pick_distractors(value, kind, pool, rng, sentence)
+        if not distractors:
+            continue
+
+        options = distractors + [value]
+        rng.shuffle(options)
+        questions.append({
+            # Blank the matched span, not the first occurrence ("20" inside "2020")
+            "question": f"Fill in the blank: {sentence[:start]}{BLANK}{sentence[end:]}",
+            "options": options,
+            "correct": options.index(value),
+            "explanation": f"The article states: \"{sentence}\""
+        })
+        used_sentences.add(sentence_key)
+        used_answers.add(value.lower())
+        used_kinds.append(kind)
+
+    _remember(by_kind)
+
+    if len(questions) < num_questions:
+        return None
+    return {"questions": questions}
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+import config
+from cache import lease_cache
+
+# =============================================================================
+# HEADLINE PUSH
+# =============================================================================
+# Clients subscribe to a (country, category) topic over Server-Sent Events.
+# One background thread per worker refreshes the subscribed topics and sends
+# each subscriber only what changed. Across workers, a lease in the shared
+# cache lets a single worker call NewsAPI per topic and interval; the others
+# pick the result up from the shared headline cache.
+
+
+def headline_version(articles):
+    """Short content hash identifying one headline list."""
+    data = json.dumps(articles, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def diff_headlines(old, new):
+    """What changed between two headline lists, keyed by article URL."""
+    old_by_url = {a['url']: a for a in old}
+    new_urls = {a['url'] for a in new}
+    return {
+        'added': [a for a in new if a['url'] not in old_by_url],
+        'changed': [a for a in new if a['url'] in old_by_url and old_by_url[a['url']] != a],
+        'removed': [url for url in old_by_url if url not in new_urls],
+        'order': [a['url'] for a in new],
+    }
+
+
+class _Topic:
+    def __init__(self, articles):
+        self.articles = articles
+        self.version = headline_version(articles)
+        self.subscribers = set()
+
+
+class HeadlineHub:
+    """Per-process registry of topics, their latest headlines and their subscribers.
+
+    ``load(topic)`` returns the cached list for a topic; ``refresh(topic)`` fetches
+    a new one from upstream.
+    """
+
+    def __init__(self, load, refresh, interval=300, max_subscribers=100):
+        self.load = load
+        self.refresh = refresh
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self._topics = {}
+        self._lock = threading.Lock()
+        self._thread_pid = None
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(t.subscribers) for t in self._topics.values())
+
+    def subscribe(self, topic):
+        """Register a subscriber; returns ``(queue, articles, version)`` or None when full."""
+        self._ensure_refresher()
+        with self._lock:
+            state = self._topics.get(topic)
+        if state is None:
+            articles = self.load(topic)
+            with self._lock:
+                state = self._topics.setdefault(topic, _Topic(articles))
+
+        events = queue.Queue(maxsize=config.PUSH_QUEUE_SIZE)
+        with self._lock:
+            if sum(len(t.subscribers) for t in self._topics.values()) >= self.max_subscribers:
+                return None
+            state.subscribers.add(events)
+            return events, state.articles, state.version
+
+    def unsubscribe(self, topic, events):
+        with self._lock:
+            state = self._topics.get(topic)
+            if state:
+                state.subscribers.discard(events)
+
+    def publish(self, topic, articles):
+        """Store a new list for ``topic`` and send the diff to its subscribers."""
+        version = headline_version(articles)
+        with self._lock:
+            state = self._topics.get(topic)
+            if state is None or state.version == version:
+                return
+            event = dict(diff_headlines(state.articles, articles), base=state.version, version=version)
+            state.articles, state.version = articles, version
+            subscribers = list(state.subscribers)
+
+        print(f"📡 {topic}: {len(event['added'])} new, {len(event['changed'])} changed, "
+              f"{len(event['removed'])} removed -> {len(subscribers)} subscribers")
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # The client is behind; it resyncs when it sees a diff for a version it lacks
+                pass
+
+    def _ensure_refresher(self):
+        """Start the refresh thread once per process (threads do not survive fork)."""
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+        threading.Thread(target=self._run, name='headline-refresh', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                # Drop topics nobody listens to any more
+                for topic in [t for t, state in self._topics.items() if not state.subscribers]:
+                    del self._topics[topic]
+                topics = list(self._topics)
+
+            for topic in topics:
+                try:
+                    # Only the worker holding the lease calls upstream for this interval
+                    if lease_cache.add(topic, os.getpid(), self.interval * 0.9):
+                        articles = self.refresh(topic)
+                    else:
+                        articles = self.load(topic)
+                    if articles is not None:
+                        self.publish(topic, articles)
+                except Exception as e:
+                    print(f"⚠️ Headline refresh failed for {topic}: {e}")
+
+
+def sse_event(event, data, event_id=None):
+    """Format one Server-Sent Events message."""
+    message = f"event: {event}\n"
+    if event_id:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data)}\n\n"
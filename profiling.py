@@ -0,0 +1,298 @@
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import config
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+# Stage timings are always collected; the rest is opt-in:
+#   - stage timings: code wraps pipeline steps in ``stage('fetch')`` etc.; the
+#     totals go out as a Server-Timing header on admin requests (every request
+#     with SERVER_TIMING) and into the slow-request log for requests slower
+#     than SLOW_REQUEST_MS
+#   - continuous sampling (PROFILE_SAMPLE_HZ > 0): a background thread samples
+#     the stacks of threads that are serving a request and aggregates them
+#   - per-request profiles: an admin request with ``X-Profile: 1`` or
+#     ``?profile=1`` is sampled at PROFILE_REQUEST_HZ; the result is saved
+#     for download from /admin/profiles/<id>
+# Profiles use the folded-stack format read by flamegraph.pl and speedscope.
+
+MAX_STACKS = 20000
+MAX_DEPTH = 128
+
+_local = threading.local()
+_active = {}                 # Thread id -> "METHOD /path" for requests in flight
+_active_lock = threading.Lock()
+slow_requests = deque(maxlen=200)
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}".replace(';', ':').replace(' ', '_')
+
+
+def fold(frame, root=None):
+    """One folded stack line (root first, ``;``-separated) for a frame."""
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    if root:
+        names.append(root.replace(';', ':').replace(' ', '_'))
+    return ';'.join(reversed(names))
+
+
+def format_folded(stacks):
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def is_admin(request):
+    """True when the request carries ADMIN_TOKEN (X-Admin-Token or a bearer token)."""
+    if not config.ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token', '')
+    authorization = request.headers.get('Authorization', '')
+    if authorization.startswith('Bearer '):
+        token = token or authorization[len('Bearer '):]
+    return hmac.compare_digest(token.encode(), config.ADMIN_TOKEN.encode())
+
+
+def profiling_current_thread():
+    """True while this thread's request is being profiled (used to keep work in-thread)."""
+    return getattr(_local, 'profiling', False)
+
+
+# =============================================================================
+# STAGE TIMINGS
+# =============================================================================
+
+@contextmanager
+def stage(name):
+    """Time a pipeline step of the current request (no-op outside requests)."""
+    from flask import g, has_request_context
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            stages = g.setdefault('stages', {})
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - started
+
+
+# =============================================================================
+# SAMPLERS
+# =============================================================================
+
+class SamplingProfiler:
+    """Samples the stacks of in-flight requests every ``interval`` seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        """Start the sampler once per process (threads do not survive fork)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='sampling-profiler', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with _active_lock:
+                active = dict(_active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                self.samples += 1
+                for thread_id, label in active.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = fold(frame, root=label)
+                    if stack in self.stacks or len(self.stacks) < MAX_STACKS:
+                        self.stacks[stack] += 1
+                    else:
+                        self.stacks[f"{label};[other]"] += 1
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            stacks = Counter(self.stacks)
+            if reset:
+                self.stacks.clear()
+                self.samples = 0
+                self.started_at = time.time()
+        return stacks
+
+
+class RequestProfile:
+    """Samples one thread at a high rate until stopped."""
+
+    def __init__(self, thread_id, label, interval):
+        self.thread_id = thread_id
+        self.label = label
+        self.interval = interval
+        self.stacks = Counter()
+        self.id = uuid.uuid4().hex[:16]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold(frame, root=self.label)] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def save(self):
+        """Write the profile to PROFILE_DIR (shared by all workers) and prune old ones."""
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(config.PROFILE_DIR, f"{self.id}.folded"), 'w', encoding='utf-8') as f:
+            f.write(format_folded(self.stacks))
+
+        profiles = sorted(
+            (entry for entry in os.scandir(config.PROFILE_DIR) if entry.name.endswith('.folded')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in profiles[:-config.PROFILE_KEEP]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+sampler = SamplingProfiler(1 / config.PROFILE_SAMPLE_HZ) if config.PROFILE_SAMPLE_HZ > 0 else None
+
+
+# =============================================================================
+# FLASK INTEGRATION
+# =============================================================================
+
+def init_app(app):
+    """Register request timing, the slow-request log, profiling triggers and /admin endpoints."""
+    from flask import Response, abort, g, jsonify, request
+
+    @app.before_request
+    def start_request_timing():
+        g.request_started = time.perf_counter()
+        label = f"{request.method} {request.path}"
+        with _active_lock:
+            _active[threading.get_ident()] = label
+        if sampler is not None:
+            sampler.start()
+
+        wants_profile = request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+        if wants_profile and is_admin(request):
+            g.profile = RequestProfile(threading.get_ident(), label, 1 / config.PROFILE_REQUEST_HZ)
+            _local.profiling = True
+            g.profile.start()
+
+    @app.after_request
+    def finish_request_timing(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        stages = g.get('stages', {})
+
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile.stop()
+            _local.profiling = False
+            profile.save()
+            response.headers['X-Profile-Id'] = profile.id
+            response.headers['X-Profile-URL'] = f"/admin/profiles/{profile.id}"
+
+        # Stage names and timings reveal internals, so only admins see them by default
+        if stages and (config.SERVER_TIMING or is_admin(request)):
+            response.headers['Server-Timing'] = ', '.join(
+                [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items()]
+                + [f"total;dur={elapsed * 1000:.1f}"]
+            )
+
+        if elapsed * 1000 >= config.SLOW_REQUEST_MS and not response.is_streamed:
+            entry = {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'ms': round(elapsed * 1000),
+                'stages': {name: round(seconds * 1000) for name, seconds in stages.items()},
+                'profile': profile.id if profile else None,
+            }
+            slow_requests.append(entry)
+            breakdown = ', '.join(f"{name} {ms} ms" for name, ms in entry['stages'].items()) or 'no stages'
+            print(f"🐌 Slow request: {request.method} {request.path} took {entry['ms']} ms ({breakdown})")
+        return response
+
+    @app.teardown_request
+    def forget_request(exc):
+        with _active_lock:
+            _active.pop(threading.get_ident(), None)
+        _local.profiling = False
+
+    def require_admin():
+        if not is_admin(request):
+            abort(403)
+
+    @app.route('/admin/profile', methods=['GET'])
+    def admin_profile():
+        """Folded stacks from the continuous sampler; ``?reset=1`` starts a new window."""
+        require_admin()
+        if sampler is None:
+            return jsonify({'status': 'error', 'message': 'Set PROFILE_SAMPLE_HZ to enable sampling'}), 404
+        stacks = sampler.snapshot(reset=request.args.get('reset') == '1')
+        return Response(format_folded(stacks), mimetype='text/plain', headers={
+            'Content-Disposition': f'attachment; filename="profile-{os.getpid()}.folded"',
+            'Cache-Control': 'no-store',
+        })
+
+    @app.route('/admin/profiles/<profile_id>', methods=['GET'])
+    def admin_request_profile(profile_id):
+        require_admin()
+        if not profile_id.isalnum():
+            abort(404)
+        try:
+            with open(os.path.join(config.PROFILE_DIR, f"{profile_id}.folded"), encoding='utf-8') as f:
+                data = f.read()
+        except OSError:
+            abort(404)
+        return Response(data, mimetype='text/plain', headers={
+            'Content-Disposition': f'attachment; filename="{profile_id}.folded"',
+            'Cache-Control': 'no-store',
+        })
+
+    @app.route('/admin/slow-requests', methods=['GET'])
+    def admin_slow_requests():
+        """Recent slow requests handled by this worker, newest first."""
+        require_admin()
+        response = jsonify({
+            'status': 'ok',
+            'threshold_ms': config.SLOW_REQUEST_MS,
+            'pid': os.getpid(),
+            'requests': list(reversed(slow_requests)),
+        })
+        response.headers['Cache-Control'] = 'no-store'
+        return response
@@ -1,82 +1,50 @@
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import random
+import time
 
-# Create Blueprint for quiz routes
-quiz_bp = Blueprint('quiz', __name__)
+import config
 
-# --- API KEYS & CONFIGURATION ---
-OPENROUTER_API_KEY = "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"
-
-print("✅ Quiz Module Loaded!")
+from cache import article_cache, summary_cache
+from deadline import request_deadline
+from extraction import parse_quiz_html, run_parser
+from fetcher import fetch_html
+from local_quiz import generate_local_quiz
+from profiling import stage
 
 # =============================================================================
 # QUIZ GENERATOR FUNCTIONS
 # =============================================================================
 
-def extract_article_content(url):
+QUIZ_MODES = ('auto', 'summary', 'full', 'local')
+MIN_ARTICLE_WORDS = 50
+RATE_LIMIT_COOLDOWN = 600  # Seconds to skip OpenRouter after a 429
+_rate_limited_until = 0
+
+def extract_article_content(url, deadline=None):
     """Extract article content for quiz generation"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-            element.decompose()
-        
-        # Try multiple extraction strategies
-        article_text = None
-        
-        # Strategy 1: Article tag
-        article = soup.find('article')
-        if article:
-            article_text = article.get_text(separator=' ', strip=True)
+        with stage('fetch'):
+            html = fetch_html(url, timeout=15, deadline=deadline)
         
-        # Strategy 2: Common content containers
-        if not article_text:
-            content_selectors = ['main', '.content', '.article-content', '.post-content']
-            for selector in content_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    text = element.get_text(separator=' ', strip=True)
-                    if len(text.split()) > 100:
-                        article_text = text
-                        break
+        # A page cut off by the deadline is still parsed, so its text can feed the fallbacks
+        parse_timeout = None
+        if deadline is not None:
+            parse_timeout = deadline.timeout(cap=config.EXTRACTION_TIMEOUT, minimum=config.PARTIAL_PARSE_TIMEOUT)
+        with stage('parse'):
+            result = run_parser(parse_quiz_html, html, timeout=parse_timeout)
         
-        # Strategy 3: Paragraphs
-        if not article_text:
-            paragraphs = soup.find_all('p')
-            if len(paragraphs) > 3:
-                article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-        
-        if article_text:
-            # Clean and limit text
-            article_text = re.sub(r'\s+', ' ', article_text).strip()
-            words = article_text.split()
-            if len(words) > 1000:
-                article_text = ' '.join(words[:1000])
-            
-            return article_text
-        
-        return None
+        return result['text'] if result else None
         
     except Exception as e:
         print(f"❌ Content extraction error: {e}")
         return None
 
-def generate_quiz(content, title):
-    """Generate quiz using OpenRouter API with fallback"""
-    try:
-        prompt = f"""Based on the following article, create exactly 3 multiple-choice questions to test comprehension.
+def build_quiz_prompt(content, title):
+    """Prompt sent to OpenRouter; ``content`` is article text or a summary context."""
+    return f"""Based on the following article, create exactly 3 multiple-choice questions to test comprehension.
 
 Article Title: {title}
 Content: {content[:2000]}
@@ -100,41 +68,103 @@ Rules:
 - Questions should test understanding of key facts from the article
 - Make questions clear and unambiguous"""
 
-        url = "https://openrouter.ai/api/v1/chat/completions"
+def format_summary_context(cached):
+    """Quiz source text built from a stored summary and its key facts."""
+    context = f"Summary: {cached['summary']}"
+    if cached.get('facts'):
+        context += "\n\nKey facts:\n" + "\n".join(f"- {fact}" for fact in cached['facts'])
+    return context
+
+def load_quiz_source(url, mode, deadline=None):
+    """Pick the text a quiz is built from.
+
+    Returns ``(content, mode_used)``. "auto" and "summary" reuse a stored summary
+    and key facts when /api/summarize has already seen the URL; otherwise (and
+    for "full" and "local") the article text is reused from the cache or scraped.
+    If scraping fails (or finds under MIN_ARTICLE_WORDS words), an expired
+    summary is used rather than nothing. "local" stays "local" whatever the
+    source, so such requests never reach the LLM.
+    """
+    summary_mode = 'local' if mode == 'local' else 'summary'
+    if mode in ('auto', 'summary'):
+        cached = summary_cache.get(url)
+        if cached:
+            return format_summary_context(cached), summary_mode
+
+    cached_article = article_cache.get(url)
+    if cached_article:
+        content = cached_article['text']
+    else:
+        content = extract_article_content(url, deadline)
+        if content:
+            article_cache.set(url, {'text': content}, config.SUMMARY_CACHE_TTL)
+
+    if not content or len(content.split()) < MIN_ARTICLE_WORDS:
+        stale = summary_cache.get(url, stale=True)
+        if stale:
+            print("⏱️ Using expired summary as quiz source")
+            return format_summary_context(stale), summary_mode
+        return None, mode
+
+    return content, 'local' if mode == 'local' else 'full'
+
+def generate_quiz(content, title, deadline=None):
+    """Generate quiz using OpenRouter API with fallback"""
+    global _rate_limited_until
+    
+    # While OpenRouter is rate limiting us, go straight to the local generator
+    if time.time() < _rate_limited_until:
+        print("🚫 Quiz API rate limited, using local generator")
+        return generate_fallback_quiz(content, title)
+    
+    try:
+        # Leave enough of the request's budget for the local generator
+        timeout = 30
+        if deadline is not None:
+            timeout = deadline.timeout(cap=timeout, reserve=config.FALLBACK_RESERVE)
+        
+        prompt = build_quiz_prompt(content, title)
+
+        url = config.OPENROUTER_URL
         
         headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Authorization": f"Bearer {config.QUIZ_OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
         }
         
         payload = {
-            "model": "google/gemini-2.0-flash-exp:free",
+            "model": config.OPENROUTER_MODEL,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.3,
             "max_tokens": 800,
         }
         
         print("🤖 Attempting to generate quiz with OpenRouter...")
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        with stage('llm'):
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
         
         if response.status_code == 200:
             result = response.json()
             if 'choices' in result and result['choices']:
-                content = result['choices'][0]['message']['content'].strip()
+                reply = result['choices'][0]['message']['content'].strip()
                 
                 # Remove markdown code blocks if present
-                content = re.sub(r'```json\s*|\s*```', '', content).strip()
+                reply = re.sub(r'```json\s*|\s*```', '', reply).strip()
                 
                 # Parse JSON
-                quiz_data = json.loads(content)
+                quiz_data = json.loads(reply)
                 
                 # Validate structure
                 if 'questions' in quiz_data and len(quiz_data['questions']) >= 3:
                     # Ensure we only return 3 questions
                     quiz_data['questions'] = quiz_data['questions'][:3]
+                    quiz_data['generator'] = 'ai'
                     print("✅ Quiz generated successfully with AI")
                     return quiz_data
         
+        if response.status_code == 429:
+            _rate_limited_until = time.time() + RATE_LIMIT_COOLDOWN
+        
         print(f"❌ OpenRouter failed: {response.status_code}")
         return generate_fallback_quiz(content, title)
         
@@ -146,6 +176,14 @@ def generate_fallback_quiz(content, title):
     """Generate fallback quiz when AI fails"""
     print("🔄 Using fallback quiz generator...")
     
+    # Article-specific questions built locally from names, numbers and dates
+    with stage('local_quiz'):
+        quiz_data = generate_local_quiz(content)
+    if quiz_data:
+        quiz_data['generator'] = 'local'
+        print("✅ Quiz generated locally from article facts")
+        return quiz_data
+    
     # Extract key sentences from content
     sentences = [s.strip() for s in re.split(r'[.!?]+', content) if len(s.strip()) > 20]
     
@@ -193,14 +231,20 @@ def generate_fallback_quiz(content, title):
         "explanation": "The main purpose of news articles is to inform readers about current affairs."
     })
     
-    return {"questions": questions}
+    # Don't leave every correct answer in position A
+    for question in questions:
+        answer = question["options"][question["correct"]]
+        random.shuffle(question["options"])
+        question["correct"] = question["options"].index(answer)
+    
+    return {"questions": questions, "generator": "generic"}
 
 # =============================================================================
 # QUIZ ROUTES
 # =============================================================================
+# URL rules live in app.LAZY_ROUTES, which imports this module on first use
 
 # --- QUIZ GENERATOR ENDPOINT ---
-@quiz_bp.route('/api/quiz/generate', methods=['POST'])
 def generate_quiz_endpoint():
     try:
         data = request.get_json()
@@ -212,23 +256,36 @@ def generate_quiz_endpoint():
                 'message': 'No URL provided'
             }), 400
         
-        print(f"\n🎯 Quiz generation for: {url}")
+        mode = (data.get('mode') or config.QUIZ_MODE).lower()
+        if mode not in QUIZ_MODES:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unknown quiz mode '{mode}'. Use one of: {', '.join(QUIZ_MODES)}"
+            }), 400
+        
+        title = data.get('title') or "Current News Article"
+        deadline = request_deadline(config.QUIZ_DEADLINE, data)
+        
+        print(f"\n🎯 Quiz generation for: {url} (mode: {mode})")
         
-        # Extract article content
-        print("Step 1: Extracting article content...")
-        content = extract_article_content(url)
+        # Reuse a stored summary or article text where possible
+        print("Step 1: Loading article content...")
+        content, mode_used = load_quiz_source(url, mode, deadline)
         
-        if not content or len(content.split()) < 50:
+        if not content:
             return jsonify({
                 'status': 'error',
                 'message': 'Unable to extract sufficient content from this article'
             }), 400
         
-        print(f"✅ Extracted {len(content.split())} words")
+        print(f"✅ Loaded {len(content.split())} words ({mode_used})")
         
         # Generate quiz
         print("Step 2: Generating quiz questions...")
-        quiz_data = generate_quiz(content, "Current News Article")
+        if mode_used == 'local':
+            quiz_data = generate_fallback_quiz(content, title)
+        else:
+            quiz_data = generate_quiz(content, title, deadline)
         
         if not quiz_data:
             return jsonify({
@@ -240,7 +297,8 @@ def generate_quiz_endpoint():
         
         return jsonify({
             'status': 'ok',
-            'quiz': quiz_data
+            'quiz': quiz_data,
+            'mode': mode_used
         })
         
     except Exception as e:
@@ -251,7 +309,6 @@ def generate_quiz_endpoint():
         }), 500
 
 # --- QUIZ SUBMISSION ENDPOINT ---
-@quiz_bp.route('/api/quiz/submit', methods=['POST'])
 def submit_quiz():
     try:
         data = request.get_json()
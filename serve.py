@@ -0,0 +1,102 @@
+"""Production launcher for AI Current Affairs Digest.
+
+Forks WORKERS processes with the app preloaded in the master, so imports and
+templates are loaded once and shared copy-on-write. All workers share the
+SQLite cache from cache.py.
+
+    python serve.py --workers 4 --bind 0.0.0.0:8000
+
+Send SIGHUP to the master process for a graceful reload (new workers start,
+old workers finish their in-flight requests within GRACEFUL_TIMEOUT).
+"""
+import argparse
+import importlib
+import os
+
+import config
+
+
+def build_options(args):
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread' if args.threads > 1 else 'sync',
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'keepalive': config.KEEPALIVE,
+        'max_requests': config.MAX_REQUESTS,
+        'max_requests_jitter': config.MAX_REQUESTS // 10,
+        'preload_app': True,
+        'accesslog': '-',
+    }
+
+
+def run_gunicorn(options):
+    from gunicorn.app.base import BaseApplication
+    from app import warm_up
+    from wsgi import application
+
+    class DigestApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master with preload_app, so lazily loaded
+            # modules are imported before forking and shared by every worker
+            warm_up()
+            return application
+
+    DigestApplication().run()
+
+
+def run_werkzeug(options):
+    """Fallback when gunicorn is unavailable (e.g. on Windows): one threaded process.
+
+    Werkzeug's ``processes`` option forks a child per request rather than
+    pre-forking workers, which would throw away every per-process cache and
+    orphan each child's extraction pool, so the worker count is ignored here.
+    """
+    from werkzeug.serving import run_simple
+    from wsgi import application
+
+    host, _, port = options['bind'].rpartition(':')
+    print("⚠️ gunicorn not installed - using one threaded Werkzeug process")
+    run_simple(host or '0.0.0.0', int(port), application,
+               threaded=True, use_reloader=False, use_debugger=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the news digest with multiple worker processes.')
+    parser.add_argument('--bind', default=config.BIND, help='host:port to listen on')
+    parser.add_argument('--workers', type=int, default=config.WORKERS, help='number of worker processes')
+    parser.add_argument('--threads', type=int, default=config.THREADS, help='threads per worker')
+    parser.add_argument('--timeout', type=int, default=config.WORKER_TIMEOUT, help='seconds before a stuck worker is restarted')
+    parser.add_argument('--graceful-timeout', type=int, default=config.GRACEFUL_TIMEOUT, help='seconds workers get to finish on reload/shutdown')
+    args = parser.parse_args(argv)
+
+    try:
+        import gunicorn  # noqa: F401
+        use_gunicorn = True
+    except ImportError:
+        use_gunicorn = False
+        args.workers = 1   # The Werkzeug fallback is a single process
+
+    if (args.workers, args.threads) != (config.WORKERS, config.THREADS):
+        # Defaults derived from the layout (extraction pool size, push
+        # subscriber cap) must follow the command line, not just the env
+        os.environ['WORKERS'], os.environ['THREADS'] = str(args.workers), str(args.threads)
+        importlib.reload(config)
+
+    options = build_options(args)
+    print(f"🚀 Starting {args.workers} workers x {args.threads} threads on {args.bind}")
+
+    if use_gunicorn:
+        run_gunicorn(options)
+    else:
+        run_werkzeug(options)
+
+
+if __name__ == '__main__':
+    main()
@@ -43,6 +43,20 @@ document.addEventListener('DOMContentLoaded', () => {
     let currentQuizData = null;
     let userAnswers = [];
 
+    // Live headline updates
+    const NEWS_POLL_INTERVAL = 5 * 60 * 1000;
+    let newsStream = null;
+    let newsPollTimer = null;
+    let currentArticles = [];
+    let currentVersion = null;
+
+    // Paging: a small first page for fast first paint, more while scrolling
+    const FIRST_PAGE_SIZE = 8;
+    const PAGE_SIZE = 20;
+    let nextCursor = null;
+    let totalArticles = 0;
+    let loadingMore = false;
+
     // ===== Custom Link Panel Toggle =====
     customLinkBtn.addEventListener('click', () => {
         customLinkPanel.classList.toggle('expanded');
@@ -433,10 +447,9 @@ document.addEventListener('DOMContentLoaded', () => {
         currentRequest = controller;
 
         try {
-            const response = await fetch('/api/summarize', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ url, title }),
+            // GET lets the browser cache the summary and revalidate it with its ETag
+            const params = new URLSearchParams({ url, title });
+            const response = await fetch(`/api/summarize?${params}`, {
                 signal: controller.signal
             });
 
@@ -543,11 +556,12 @@ document.addEventListener('DOMContentLoaded', () => {
     function createArticleCard(article) {
         const card = document.createElement('div');
         card.classList.add('news-card');
+        card.dataset.url = article.url;
 
         card.innerHTML = `
             <a href="${article.url}" target="_blank" style="text-decoration: none; color: inherit; flex: 1; display: flex; flex-direction: column;">
                 <div class="card-image-wrapper">
-                    <img src="${article.image || ''}" alt="Article Image" onerror="this.style.display='none'; this.parentNode.classList.add('no-image');">
+                    <img src="${article.image || ''}" alt="Article Image" loading="lazy" decoding="async" onerror="this.style.display='none'; this.parentNode.classList.add('no-image');">
                 </div>
                 <div class="card-content">
                     <h4 class="card-title">${article.title}</h4>
@@ -574,45 +588,202 @@ document.addEventListener('DOMContentLoaded', () => {
         return card;
     }
 
-    async function fetchAndRenderNews() {
+    function updateArticleCount() {
+        articleCount.textContent = `Showing ${currentArticles.length} of ${totalArticles} articles`;
+    }
+
+    function appendArticles(articles, animate = true) {
+        articles.forEach((article, index) => {
+            const card = createArticleCard(article);
+            if (animate) {
+                card.style.animation = `fadeIn 0.5s ease forwards ${index * 0.05}s`;
+                card.style.opacity = '0';
+            }
+            articlesContainer.appendChild(card);
+        });
+    }
+
+    function renderArticles(articles, animate = true) {
+        articlesContainer.innerHTML = '';
+        appendArticles(articles, animate);
+        updateArticleCount();
+    }
+
+    async function loadMoreNews() {
+        if (!nextCursor || loadingMore) return;
+        loadingMore = true;
+
+        try {
+            const params = new URLSearchParams({
+                country: countrySelect.value,
+                category: categorySelect.value,
+                cursor: nextCursor,
+                limit: PAGE_SIZE
+            });
+            const response = await fetch(`/api/news?${params}`);
+            const data = await response.json();
+
+            if (data.status === 'ok') {
+                // Cards pushed live while this page was loading are not added twice
+                const shown = new Set(currentArticles.map(article => article.url));
+                const fresh = data.articles.filter(article => !shown.has(article.url));
+                currentArticles.push(...fresh);
+                appendArticles(fresh);
+                nextCursor = data.next_cursor;
+                totalArticles = data.total;
+                updateArticleCount();
+            }
+        } catch (error) {
+            showNotification('Could not load more headlines', 'error');
+        } finally {
+            loadingMore = false;
+        }
+    }
+
+    // Load the next page when the end of the grid scrolls into view
+    const scrollSentinel = document.createElement('div');
+    articlesContainer.after(scrollSentinel);
+    if (window.IntersectionObserver) {
+        new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) loadMoreNews();
+        }, { rootMargin: '600px' }).observe(scrollSentinel);
+    }
+
+    function applyHeadlineDiff(diff) {
+        // Only new and changed cards are built; unchanged ones are just reordered
+        const cards = new Map();
+        articlesContainer.querySelectorAll('.news-card').forEach(card => cards.set(card.dataset.url, card));
+        const articles = new Map(currentArticles.map(article => [article.url, article]));
+        // New articles older than the last loaded card arrive with later pages instead
+        const oldestShown = currentArticles.length ? (currentArticles[currentArticles.length - 1].published_at || '') : '';
+        const isLoaded = (article) => cards.has(article.url) || !nextCursor || (article.published_at || '') >= oldestShown;
+
+        diff.removed.forEach(url => {
+            if (cards.has(url)) cards.get(url).remove();
+            cards.delete(url);
+            articles.delete(url);
+        });
+
+        [...diff.added, ...diff.changed].filter(isLoaded).forEach(article => {
+            const card = createArticleCard(article);
+            card.style.animation = 'fadeIn 0.5s ease forwards';
+            if (cards.has(article.url)) cards.get(article.url).replaceWith(card);
+            cards.set(article.url, card);
+            articles.set(article.url, article);
+        });
+
+        diff.order.forEach(url => {
+            if (cards.has(url)) articlesContainer.appendChild(cards.get(url));
+        });
+
+        currentArticles = diff.order.map(url => articles.get(url)).filter(Boolean);
+        currentVersion = diff.version;
+        totalArticles = diff.order.length;
+        updateArticleCount();
+
+        const added = diff.added.filter(article => cards.has(article.url)).length;
+        if (added > 0) {
+            showNotification(`${added} new headline${added > 1 ? 's' : ''}`, 'info');
+        }
+    }
+
+    function stopHeadlineUpdates() {
+        if (newsStream) {
+            newsStream.close();
+            newsStream = null;
+        }
+        clearInterval(newsPollTimer);
+        newsPollTimer = null;
+    }
+
+    function subscribeToHeadlines(countryCode, category) {
+        stopHeadlineUpdates();
+
+        if (!window.EventSource) {
+            newsPollTimer = setInterval(() => fetchAndRenderNews({ quiet: true }), NEWS_POLL_INTERVAL);
+            return;
+        }
+
+        // The server only sends a snapshot when our version is out of date
+        const params = new URLSearchParams({ country: countryCode, category: category });
+        if (currentVersion) params.set('since', currentVersion);
+        newsStream = new EventSource(`/api/news/stream?${params}`);
+
+        newsStream.addEventListener('snapshot', (e) => {
+            const data = JSON.parse(e.data);
+            currentArticles = data.articles;
+            currentVersion = data.version;
+            nextCursor = data.next_cursor;
+            totalArticles = data.total;
+            renderArticles(currentArticles, false);
+        });
+
+        newsStream.addEventListener('diff', (e) => {
+            const diff = JSON.parse(e.data);
+            if (diff.base !== currentVersion) {
+                // We missed an update; reconnect to get a fresh snapshot
+                subscribeToHeadlines(countryCode, category);
+                return;
+            }
+            applyHeadlineDiff(diff);
+        });
+
+        newsStream.onerror = () => {
+            // EventSource retries by itself unless the server refused the stream (e.g. 503 when full)
+            if (newsStream && newsStream.readyState === EventSource.CLOSED) {
+                newsStream = null;
+                newsPollTimer = setInterval(() => fetchAndRenderNews({ quiet: true }), NEWS_POLL_INTERVAL);
+            }
+        };
+    }
+
+    async function fetchAndRenderNews({ quiet = false } = {}) {
         const timeFrame = document.querySelector('.tab-button.active').getAttribute('data-time');
         const countryCode = countrySelect.value;
         const category = categorySelect.value;
 
-        articlesContainer.innerHTML = '';
-        loadingState.style.display = 'flex';
+        if (!quiet) {
+            stopHeadlineUpdates();
+            articlesContainer.innerHTML = '';
+            loadingState.style.display = 'flex';
+        }
 
         try {
-            const response = await fetch('/api/news', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    time_frame: timeFrame,
-                    country: countryCode,
-                    category: category
-                })
+            const params = new URLSearchParams({
+                time_frame: timeFrame,
+                country: countryCode,
+                category: category,
+                limit: FIRST_PAGE_SIZE
             });
+            const response = await fetch(`/api/news?${params}`);
 
             const data = await response.json();
             loadingState.style.display = 'none';
 
+            if (quiet && data.version === currentVersion) {
+                return;
+            }
+
             if (data.status === 'ok' && data.articles && data.articles.length > 0) {
-                articleCount.textContent = `Showing ${data.count} articles`;
                 currentFilters.textContent = `${data.filters.category} • ${data.filters.country}`;
-
-                data.articles.forEach((article, index) => {
-                    const card = createArticleCard(article);
-                    card.style.animation = `fadeIn 0.5s ease forwards ${index * 0.05}s`;
-                    card.style.opacity = '0';
-                    articlesContainer.appendChild(card);
-                });
+                currentArticles = data.articles;
+                currentVersion = data.version;
+                nextCursor = data.next_cursor;
+                totalArticles = data.total;
+                renderArticles(currentArticles, !quiet);
+
+                if (!quiet) {
+                    subscribeToHeadlines(countryCode, category);
+                }
             } else {
                 currentFilters.textContent = `${category.toUpperCase()} in ${countryCode.toUpperCase()}`;
                 articlesContainer.innerHTML = '<p class="error-message"><i class="fas fa-exclamation-triangle"></i> No headlines found.</p>';
             }
         } catch (error) {
             loadingState.style.display = 'none';
-            articlesContainer.innerHTML = '<p class="error-message"><i class="fas fa-plug"></i> Connection failed.</p>';
+            if (!quiet) {
+                articlesContainer.innerHTML = '<p class="error-message"><i class="fas fa-plug"></i> Connection failed.</p>';
+            }
         }
     }
 
@@ -625,8 +796,8 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
 
-    countrySelect.addEventListener('change', fetchAndRenderNews);
-    categorySelect.addEventListener('change', fetchAndRenderNews);
+    countrySelect.addEventListener('change', () => fetchAndRenderNews());
+    categorySelect.addEventListener('change', () => fetchAndRenderNews());
 
     customUrlInput.addEventListener('keypress', (e) => {
         if (e.key === 'Enter') {
@@ -0,0 +1,9 @@
+"""WSGI entry point for production servers.
+
+    gunicorn --preload -w 4 wsgi:application
+
+or simply ``python serve.py``, which applies the settings from config.py.
+"""
+from app import app
+
+application = app